@@ -66,6 +66,13 @@ const toolSchema = mongoose.Schema(
 			type: Number,
 			default: 0,
 		},
+		trendingScore: {
+			type: Number,
+			default: 0,
+		},
+		trendingUpdatedAt: {
+			type: Date,
+		},
 		analytics: {
 			totalViews: {
 				type: Number,
@@ -83,9 +90,24 @@ const toolSchema = mongoose.Schema(
 				type: Number,
 				default: 0,
 			},
+			totalClicks: {
+				type: Number,
+				default: 0,
+			},
+			weeklyClicks: {
+				type: Number,
+				default: 0,
+			},
+			monthlyClicks: {
+				type: Number,
+				default: 0,
+			},
 			lastViewedAt: {
 				type: Date,
 			},
+			rolledUpAt: {
+				type: Date,
+			},
 		},
 		commentStats: {
 			totalComments: {
@@ -0,0 +1,135 @@
+# analytics_rollup.py
+import argparse
+import traceback
+from datetime import datetime, timedelta, timezone
+from connections import get_db
+from metrics import Metrics
+from profiling import add_profile_arguments, profiled
+
+# Windows match trackView in controllers/viewController.js
+WEEK = timedelta(days=7)
+MONTH = timedelta(days=30)
+
+# Walk each collection in {tool: 1, createdAt: -1} index order
+TOOL_CREATED_INDEX = [('tool', 1), ('createdAt', -1)]
+
+def _window_count(since):
+    return {'$sum': {'$cond': [{'$gte': ['$createdAt', since]}, 1, 0]}}
+
+def view_rollup_pipeline(now):
+    """Per-tool total/unique/weekly/monthly views and last view time
+
+    The first $group collapses each (tool, session) pair so unique views
+    are a plain count in the second, without building per-tool session sets.
+    """
+    return [
+        {'$sort': {'tool': 1, 'createdAt': -1}},
+        {'$group': {
+            '_id': {'tool': '$tool', 'session': '$sessionId'},
+            'views': {'$sum': 1},
+            'weekly': _window_count(now - WEEK),
+            'monthly': _window_count(now - MONTH),
+            'last': {'$first': '$createdAt'},
+        }},
+        {'$group': {
+            '_id': '$_id.tool',
+            'totalViews': {'$sum': '$views'},
+            'uniqueViews': {'$sum': 1},
+            'weeklyViews': {'$sum': '$weekly'},
+            'monthlyViews': {'$sum': '$monthly'},
+            'lastViewedAt': {'$max': '$last'},
+        }},
+    ]
+
+def click_rollup_pipeline(now):
+    """Per-tool total/weekly/monthly external clicks"""
+    return [
+        {'$sort': {'tool': 1, 'createdAt': -1}},
+        {'$group': {
+            '_id': '$tool',
+            'totalClicks': {'$sum': 1},
+            'weeklyClicks': _window_count(now - WEEK),
+            'monthlyClicks': _window_count(now - MONTH),
+        }},
+    ]
+
+def build_rollup_operations(view_rows, click_rows, now):
+    """One UpdateOne per tool setting every analytics counter"""
+    from pymongo import UpdateOne
+
+    counters = {}
+    for row in view_rows:
+        tool_id = row.pop('_id')
+        counters.setdefault(tool_id, {}).update(row)
+    for row in click_rows:
+        tool_id = row.pop('_id')
+        counters.setdefault(tool_id, {}).update(row)
+
+    operations = []
+    for tool_id, values in counters.items():
+        update = {
+            'analytics.totalViews': values.get('totalViews', 0),
+            'analytics.uniqueViews': values.get('uniqueViews', 0),
+            'analytics.weeklyViews': values.get('weeklyViews', 0),
+            'analytics.monthlyViews': values.get('monthlyViews', 0),
+            'analytics.totalClicks': values.get('totalClicks', 0),
+            'analytics.weeklyClicks': values.get('weeklyClicks', 0),
+            'analytics.monthlyClicks': values.get('monthlyClicks', 0),
+            'analytics.rolledUpAt': now,
+        }
+        if values.get('lastViewedAt'):
+            update['analytics.lastViewedAt'] = values['lastViewedAt']
+        operations.append(UpdateOne({'_id': tool_id}, {'$set': update}))
+    return operations
+
+def rollup_analytics(dry_run=False):
+    """Recompute per-tool view and click counters from toolviews and clicks"""
+
+    metrics = Metrics('rollup_analytics')
+
+    try:
+        db = get_db()
+        now = datetime.now(timezone.utc)
+        print("🔄 Rolling up tool views and clicks...")
+
+        with metrics.timer('views_aggregate'):
+            view_rows = list(db.toolviews.aggregate(
+                view_rollup_pipeline(now), allowDiskUse=True, hint=TOOL_CREATED_INDEX
+            ))
+        print(f"👀 Views rolled up for {len(view_rows)} tools")
+
+        with metrics.timer('clicks_aggregate'):
+            click_rows = list(db.clicks.aggregate(
+                click_rollup_pipeline(now), allowDiskUse=True, hint=TOOL_CREATED_INDEX
+            ))
+        print(f"🖱️  Clicks rolled up for {len(click_rows)} tools")
+
+        operations = build_rollup_operations(view_rows, click_rows, now)
+        metrics.incr('tools', len(operations))
+
+        if not operations:
+            print("✅ No views or clicks recorded yet")
+            return
+
+        if dry_run:
+            print(f"🧪 Dry run: would update {len(operations)} tools")
+            return
+
+        with metrics.timer('bulk_write'):
+            result = db.tools.bulk_write(operations, ordered=False)
+        metrics.incr('tools_modified', result.modified_count)
+        print(f"✅ Updated analytics for {result.modified_count} of {len(operations)} tools")
+        print("💡 Run refresh_redis_cache.py to publish the new counters")
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Roll up tool views and clicks into tools.analytics"))
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    with profiled('rollup_analytics', args.profile, args.profile_dir):
+        rollup_analytics(dry_run=args.dry_run)
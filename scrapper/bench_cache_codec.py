@@ -0,0 +1,38 @@
+# bench_cache_codec.py
+import json
+import sys
+import time
+
+import cache_codec
+from bench_catalog import synthetic_catalog
+from cache_codec import CacheCodec, available_codecs
+
+def timed_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    codecs = [(name, level) for name in available_codecs() for level in (1, 3, 6)]
+    print(f"{'tools':>8} {'value':>8} {'codec':>8} {'ratio':>6} {'encode ms':>10} {'decode ms':>10}")
+    for size in sizes:
+        tools = synthetic_catalog(size)
+        values = {
+            'allTools': json.dumps(tools),
+            'tool': json.dumps(tools[len(tools) // 2]),
+        }
+        for label, text in values.items():
+            repeat = 3 if label == 'allTools' else 500
+            for name, level in codecs:
+                codec = CacheCodec(name, min_bytes=0, level=level)
+                encoded, encode_ms = timed_ms(lambda: codec.encode(text), repeat)
+                decoded, decode_ms = timed_ms(lambda: cache_codec.decode(encoded), repeat)
+                assert decoded == text
+                ratio = len(text.encode('utf-8')) / len(encoded)
+                print(f"{size:>8} {label:>8} {f'{name}:{level}':>8} {ratio:>6.1f} "
+                      f"{encode_ms:>10.3f} {decode_ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
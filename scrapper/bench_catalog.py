@@ -0,0 +1,51 @@
+# bench_catalog.py
+import json
+import random
+from datetime import datetime, timedelta
+
+def load_templates(path='mainData.txt'):
+    """Cleaned tools from mainData.txt, used as templates for synthetic ones"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def synthetic_catalog(count, seed=42, templates=None):
+    """Approved tools shaped like refresh_redis_cache's converted documents
+
+    Tools are cloned from mainData.txt with numbered names, random views,
+    ratings and featured flags, and returned in the (isFeatured desc,
+    createdAt desc) order the cache refresh fetches them in.
+    """
+    rng = random.Random(seed)
+    templates = templates or load_templates()
+    now = datetime(2025, 1, 1)
+    tools = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        copy_no = i // len(templates)
+        name = template['name'] if copy_no == 0 else f"{template['name']} {copy_no}"
+        ratings = rng.randint(0, 200)
+        rating_sum = round(rng.uniform(1, 5) * ratings)
+        created = now - timedelta(minutes=rng.randint(0, 525600))
+        tools.append({
+            **template,
+            '_id': f'{i:024x}',
+            'name': name,
+            'slug': name.lower().replace(' ', '-').replace('.', ''),
+            'isFeatured': rng.random() < 0.05,
+            'submittedBy': f'{0:024x}',
+            'totalRatingSum': rating_sum,
+            'numberOfRatings': ratings,
+            'averageRating': round(rating_sum / ratings, 2) if ratings else 0,
+            'analytics': {
+                'totalViews': int(rng.paretovariate(1.2) * 10),
+                'uniqueViews': 0,
+                'weeklyViews': 0,
+                'monthlyViews': 0,
+            },
+            'createdAt': created.isoformat(),
+            'updatedAt': created.isoformat(),
+            '__v': 0,
+        })
+    tools.sort(key=lambda tool: tool['createdAt'], reverse=True)
+    tools.sort(key=lambda tool: tool['isFeatured'], reverse=True)
+    return tools
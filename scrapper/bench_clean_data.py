@@ -0,0 +1,69 @@
+# bench_clean_data.py
+import json
+import random
+import sys
+import time
+
+from clean_data import BLOCK_SEPARATOR, gc_paused, parse_tool_blocks
+from tool_schema import transform_batch
+
+def synthetic_rows(count, seed=42, invalid_ratio=0.01):
+    """Scraper-shaped rows, with a small share of invalid ones"""
+    rng = random.Random(seed)
+    tags = ['ai', 'seo', 'marketing', 'writing', ' content ', 'automation', 'design', '']
+    rows = []
+    for i in range(count):
+        row = {
+            'name': f'Tool {i}',
+            'tagline': f'AI tagline for tool {i}',
+            'description': f'Longer description of what tool {i} does for marketing teams',
+            'websiteUrl': f'https://tool{i}.example.com',
+            'logoUrl': '',
+            'tags': ','.join(rng.sample(tags, 4)),
+            'appStoreUrl': None,
+            'playStoreUrl': None,
+            'visual': {'type': 'gradient', 'color': '#3B82F6', 'content': [{'icon': 'rocket', 'text': 'AI Powered'}]},
+        }
+        if rng.random() < invalid_ratio:
+            row['websiteUrl'] = None
+        rows.append(row)
+    return rows
+
+def as_scraper_output(rows):
+    """Render rows the way MultiSourceAIToolScraper.save_tools_to_file does"""
+    parts = ['// AI Tools scraped in submitTool format\n// Each tool can be directly used with the submitTool API\n\n']
+    for i, row in enumerate(rows, 1):
+        parts.append(f'// Tool {i}: {row["name"]}\n')
+        parts.append(json.dumps(row, ensure_ascii=False, indent=2))
+        parts.append('\n\n' + BLOCK_SEPARATOR + '\n\n')
+    return ''.join(parts)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch_size = 10_000
+
+    print(f"🧪 Generating {count:,} synthetic scraped rows...")
+    rows = synthetic_rows(count)
+
+    start = time.perf_counter()
+    valid = rejected = 0
+    with gc_paused():
+        for offset in range(0, count, batch_size):
+            ok, bad = transform_batch(rows[offset:offset + batch_size])
+            valid += len(ok)
+            rejected += len(bad)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  Transform: {elapsed:.2f}s ({count / elapsed / 1e3:.0f}k rows/s), "
+          f"{valid:,} valid, {rejected:,} rejected")
+
+    content = as_scraper_output(rows)
+    start = time.perf_counter()
+    with gc_paused():
+        records, bad_blocks = parse_tool_blocks(content)
+    parsed = time.perf_counter() - start
+    print(f"⏱️  Parse text: {parsed:.2f}s ({len(records) / parsed / 1e3:.0f}k rows/s), "
+          f"{len(bad_blocks)} bad blocks")
+    print(f"📈 Parse + transform: {parsed + elapsed:.2f}s for {count:,} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# bench_paged_cache.py
+import json
+import sys
+import time
+
+from bench_catalog import synthetic_catalog
+from paged_cache import PAGE_SIZE, build_pages
+
+def parse_ms(payload, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(payload)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"{'tools':>8} {'allTools KB':>12} {'parse ms':>9} {'page KB':>8} {'parse ms':>9}")
+    for size in sizes:
+        tools = synthetic_catalog(size)
+        blob = json.dumps(tools)
+        page = json.dumps(build_pages(tools[:PAGE_SIZE])[0], separators=(',', ':'))
+        print(f"{size:>8} {len(blob) / 1024:>12.0f} {parse_ms(blob):>9.2f} "
+              f"{len(page) / 1024:>8.1f} {parse_ms(page, 200):>9.3f}")
+
+if __name__ == "__main__":
+    main()
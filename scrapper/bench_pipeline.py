@@ -0,0 +1,475 @@
+# bench_pipeline.py
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench_catalog import load_templates, synthetic_catalog
+from bench_clean_data import as_scraper_output, synthetic_rows
+
+RESULTS_DIR = 'bench_results'
+LOGO_DIR = 'tool_logos'
+DEFAULT_SIZES = [1000, 10000, 100000]
+# Stages that go through HTTP or a database stand-in are capped, since
+# mongomock's find_one is a linear scan and 100k local requests add little
+CAPPED_STAGES = {'scrape', 'logos', 'upload', 'refresh'}
+REGRESSION_THRESHOLD = 0.10
+# Fewer equal-sized units than this and no percentiles are reported
+MIN_PERCENTILE_UNITS = 20
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class StageRun:
+    """Timings of one stage: per-unit latencies, items processed and RSS
+
+    A unit is a fixed amount of work (one tool, one page, one batch).
+    Percentiles are taken only over units of the most common size, so a
+    short last batch does not skew them, and only when there are at least
+    MIN_PERCENTILE_UNITS of those.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.unit_sizes = []
+        self.items = 0
+        self.extra = {}
+        self._start = None
+        self.baseline_rss = None
+
+    def begin(self):
+        """Mark the end of setup; only what follows is measured"""
+        self.baseline_rss = peak_rss_mb()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def unit(self, items=1):
+        start = time.perf_counter()
+        yield
+        self.latencies.append(time.perf_counter() - start)
+        self.unit_sizes.append(items)
+        self.items += items
+
+    def result(self):
+        elapsed = time.perf_counter() - self._start
+        unit_items = max(set(self.unit_sizes), key=self.unit_sizes.count) if self.unit_sizes else None
+        latencies = sorted(
+            latency for latency, items in zip(self.latencies, self.unit_sizes) if items == unit_items
+        )
+        if len(latencies) < MIN_PERCENTILE_UNITS:
+            latencies = []
+        return {
+            'items': self.items,
+            'units': len(self.latencies),
+            'unit_items': unit_items,
+            'seconds': round(elapsed, 6),
+            'items_per_sec': round(self.items / elapsed, 1) if elapsed > 0 else None,
+            'latency_ms': {
+                f'p{int(q * 100)}': round(percentile(latencies, q) * 1000, 3) if latencies else None
+                for q in (0.5, 0.95, 0.99)
+            },
+            'baseline_rss_mb': round(self.baseline_rss, 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            **self.extra,
+        }
+
+# Local stand-ins
+
+def _product_page(tools):
+    """Product-Hunt-like listing markup, one <article> per tool"""
+    articles = ''.join(
+        f'<article><a href="{tool["websiteUrl"]}"><img src="/logo/{i}.png"></a>'
+        f'<h3>{tool["name"]}</h3><p class="tagline">{tool["tagline"]}</p></article>'
+        for i, tool in enumerate(tools)
+    )
+    return f'<html><body><main>{articles}</main></body></html>'.encode('utf-8')
+
+def load_logo_fixtures(logo_dir=LOGO_DIR):
+    fixtures = []
+    if os.path.isdir(logo_dir):
+        for name in sorted(os.listdir(logo_dir)):
+            with open(os.path.join(logo_dir, name), 'rb') as f:
+                fixtures.append(f.read())
+    # A 1x1 PNG when the logo directory is not around
+    return fixtures or [bytes.fromhex(
+        '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+        '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082'
+    )]
+
+@contextmanager
+def fixture_server(tools, page_size=10):
+    """Serve /page/{n} listings and /logo/{n}.png fixtures on localhost"""
+    logos = load_logo_fixtures()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = self.path.strip('/').split('/')
+            if len(parts) == 2 and parts[0] == 'page' and parts[1].isdigit():
+                start = int(parts[1]) * page_size
+                body, content_type = _product_page(tools[start:start + page_size]), 'text/html'
+            elif len(parts) == 2 and parts[0] == 'logo' and parts[1].split('.')[0].isdigit():
+                body, content_type = logos[int(parts[1].split('.')[0]) % len(logos)], 'image/png'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def stand_in_clients():
+    """Point connections at local stand-ins; returns a description of what is used
+
+    BENCH_MONGO_URI / BENCH_REDIS_URL select a local mongod / redis-server,
+    otherwise mongomock and fakeredis are used. Never the production URLs.
+    """
+    import connections
+
+    mongo_uri = os.getenv('BENCH_MONGO_URI')
+    redis_url = os.getenv('BENCH_REDIS_URL')
+    if mongo_uri:
+        connections.MONGO_URI = mongo_uri
+        mongo_client, mongo = None, mongo_uri
+    else:
+        import mongomock
+        mongo_client, mongo = mongomock.MongoClient(), 'mongomock'
+    if redis_url:
+        connections.REDIS_URL = redis_url
+        redis_pool, redis = None, redis_url
+    else:
+        import fakeredis
+        import redis as redis_py
+        server = fakeredis.FakeServer()
+
+        def redis_pool(decode_responses):
+            return redis_py.ConnectionPool(
+                connection_class=fakeredis.FakeConnection, server=server, decode_responses=decode_responses,
+            )
+        redis = 'fakeredis'
+    connections.install_stand_ins(mongo_client, redis_pool)
+    return {'mongo': mongo, 'redis': redis}
+
+def _seed_tools(tools_collection, tools):
+    """Insert catalog tools as Mongo documents (ObjectIds, datetimes)"""
+    from bson import ObjectId
+
+    docs = []
+    for tool in tools:
+        docs.append({
+            **tool,
+            '_id': ObjectId(tool['_id']),
+            'submittedBy': ObjectId(tool['submittedBy']),
+            'status': 'approved',
+            'createdAt': datetime.fromisoformat(tool['createdAt']),
+            'updatedAt': datetime.fromisoformat(tool['updatedAt']),
+        })
+    tools_collection.delete_many({})
+    for start in range(0, len(docs), 10000):
+        tools_collection.insert_many(docs[start:start + 10000])
+
+# Stages; each takes (size, run) and calls run.begin() once setup is done
+
+def stage_scrape(size, run):
+    """Fetch and parse listing pages with MultiSourceAIToolScraper"""
+    from bs4 import BeautifulSoup
+    from scrapper import MultiSourceAIToolScraper
+
+    tools = synthetic_catalog(size)
+    scraper = MultiSourceAIToolScraper()
+    with fixture_server(tools) as base_url:
+        run.begin()
+        for page in range(-(-size // 10)):
+            with run.unit(min(10, size - page * 10)):
+                response = scraper.session.get(f'{base_url}/page/{page}', timeout=10)
+                soup = BeautifulSoup(response.text, 'html.parser')
+                for product in soup.find_all('article')[:10]:
+                    scraper.extract_product_hunt_data(product, base_url)
+
+def stage_clean(size, run, batch_size=50):
+    """parse_tool_blocks + transform_batch over scraper-format text"""
+    from clean_data import parse_tool_blocks
+    from tool_schema import transform_batch
+
+    rows = synthetic_rows(size)
+    chunks = [as_scraper_output(rows[start:start + batch_size]) for start in range(0, size, batch_size)]
+    run.begin()
+    valid = 0
+    for chunk in chunks:
+        with run.unit(chunk.count('// Tool ')):
+            records, _ = parse_tool_blocks(chunk)
+            valid += len(transform_batch(records)[0])
+    run.extra['valid'] = valid
+
+def stage_slugs(size, run, batch_size=500):
+    """generate_slugs over catalog names"""
+    from slug_utils import generate_slugs
+
+    names = [tool['name'] for tool in synthetic_catalog(size)]
+    run.begin()
+    for start in range(0, size, batch_size):
+        batch = names[start:start + batch_size]
+        with run.unit(len(batch)):
+            generate_slugs(batch)
+
+def stage_logos(size, run):
+    """download_logo from the fixture server into a scratch directory"""
+    from download_tool_logos import download_logo
+
+    tools = synthetic_catalog(size)
+    target = tempfile.mkdtemp(prefix='bench_logos_')
+    try:
+        with fixture_server(tools) as base_url:
+            run.begin()
+            saved = 0
+            for i, tool in enumerate(tools):
+                with run.unit():
+                    saved += download_logo(f'{base_url}/logo/{i}.png', os.path.join(target, f"{tool['slug']}.png"))
+        run.extra['saved'] = saved
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+def stage_upload(size, run, batch_size=1000):
+    """upload_tool_batch into the Mongo stand-in"""
+    from connections import get_db
+    from upload_to_mongo import load_existing_names, upload_tool_batch
+
+    run.extra['stand_ins'] = stand_in_clients()
+    tools_collection = get_db().bench_tools
+    tools_collection.delete_many({})
+    tools_collection.create_index('slug')
+    rows = [
+        {key: tool[key] for key in ('name', 'tagline', 'description', 'websiteUrl', 'logoUrl', 'tags')}
+        for tool in synthetic_catalog(size)
+    ]
+    run.begin()
+    existing_names = load_existing_names(tools_collection)
+    reserved_slugs = set()
+    for start in range(0, size, batch_size):
+        batch = rows[start:start + batch_size]
+        with run.unit(len(batch)):
+            upload_tool_batch(batch, tools_collection, existing_names, reserved_slugs)
+    tools_collection.drop()
+
+def stage_cache_build(size, run):
+    """The payloads refresh_redis_cache builds, without Redis
+
+    The four builders do different work, so each is timed on its own in
+    builders_ms rather than as units of one latency distribution.
+    """
+    from listing_cache import build_listings
+    from paged_cache import build_pages
+    from search_index import build_search_index, search_index_payloads
+
+    tools = synthetic_catalog(size)
+    builders = [
+        ('allTools_json', lambda: json.dumps(tools)),
+        ('pages', lambda: build_pages(tools)),
+        ('listings', lambda: build_listings(tools)),
+        ('search_index', lambda: search_index_payloads(build_search_index(tools))),
+    ]
+    run.begin()
+    for name, build in builders:
+        start = time.perf_counter()
+        build()
+        run.extra.setdefault('builders_ms', {})[name] = round((time.perf_counter() - start) * 1000, 3)
+    run.items = size
+
+def stage_refresh(size, run):
+    """A full refresh_redis_cache run against the Mongo and Redis stand-ins"""
+    from connections import get_db
+    from metrics import job_path
+    from refresh_redis_cache import refresh_redis_cache
+
+    run.extra['stand_ins'] = stand_in_clients()
+    _seed_tools(get_db().tools, synthetic_catalog(size))
+    metrics_template = os.path.join(tempfile.gettempdir(), f'bench_refresh_{os.getpid()}.json')
+    os.environ['METRICS_JSON'] = metrics_template
+    metrics_path = job_path(metrics_template, 'refresh_redis_cache')
+    run.begin()
+    with run.unit(size):
+        ok = refresh_redis_cache(clear=True)
+    run.extra['ok'] = ok
+    try:
+        with open(metrics_path, 'r', encoding='utf-8') as f:
+            histograms = json.load(f)['histograms']
+        run.extra['phases_ms'] = {name: round(h['sum'] * 1000, 3) for name, h in histograms.items()}
+        os.remove(metrics_path)
+    except (OSError, KeyError, json.JSONDecodeError):
+        pass
+
+STAGES = {
+    'scrape': (stage_scrape, ['requests', 'bs4']),
+    'clean': (stage_clean, []),
+    'slugs': (stage_slugs, []),
+    'logos': (stage_logos, ['requests']),
+    'upload': (stage_upload, ['pymongo']),
+    'cache_build': (stage_cache_build, []),
+    'refresh': (stage_refresh, ['pymongo', 'redis']),
+}
+
+def missing_modules(stage):
+    import importlib.util
+
+    _, modules = STAGES[stage]
+    if stage in ('upload', 'refresh'):
+        if not os.getenv('BENCH_MONGO_URI'):
+            modules = modules + ['mongomock']
+        if stage == 'refresh' and not os.getenv('BENCH_REDIS_URL'):
+            modules = modules + ['fakeredis']
+    return [name for name in modules if importlib.util.find_spec(name) is None]
+
+def run_stage(stage, size):
+    """Run one stage in this process and return its result"""
+    missing = missing_modules(stage)
+    if missing:
+        return {'skipped': f"missing {', '.join(missing)}"}
+    run = StageRun()
+    stage_fn, _ = STAGES[stage]
+    stage_fn(size, run)
+    return run.result()
+
+def run_isolated(stage, size):
+    """Run one stage in a fresh interpreter so peak RSS belongs to that stage alone"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', stage, str(size)],
+        capture_output=True, text=True,
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        error = (completed.stderr.strip().splitlines() or ['no output'])[-1]
+        return {'error': error}
+    return json.loads(lines[-1])
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Print stages whose throughput dropped or peak RSS grew by more than threshold"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if not old or 'items_per_sec' not in old or 'items_per_sec' not in result:
+            continue
+        if (old['items_per_sec'] and result['items_per_sec'] is not None
+                and result['items_per_sec'] < old['items_per_sec'] * (1 - threshold)):
+            regressions.append(f"{key}: {old['items_per_sec']:.0f} -> {result['items_per_sec']:.0f} items/s")
+        grown = result['peak_rss_mb'] - result['baseline_rss_mb']
+        old_grown = old['peak_rss_mb'] - old['baseline_rss_mb']
+        if old_grown > 1 and grown > old_grown * (1 + threshold):
+            regressions.append(f"{key}: {old_grown:.1f} -> {grown:.1f} MB above baseline RSS")
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regressions against {baseline_path}:")
+        for line in regressions:
+            print(f"   - {line}")
+    else:
+        print(f"\n✅ No regressions beyond {threshold:.0%} against {baseline_path}")
+    return regressions
+
+def print_result(key, result):
+    if 'skipped' in result or 'error' in result:
+        print(f"   {key:<20} {'⏭️  ' + result['skipped'] if 'skipped' in result else '❌ ' + result['error']}")
+        return
+    latency = result['latency_ms']
+    throughput = f"{result['items_per_sec']:>11,.0f}/s" if result['items_per_sec'] is not None else f"{'n/a':>13}"
+    if latency['p50'] is None:
+        percentiles = f"{'(too few units for percentiles)':<49}"
+    else:
+        percentiles = f"p50 {latency['p50']:>9.3f}ms  p95 {latency['p95']:>9.3f}ms  p99 {latency['p99']:>9.3f}ms"
+    print(f"   {key:<20} {throughput}  {percentiles}  "
+          f"peak {result['peak_rss_mb']:>7.1f}MB (+{result['peak_rss_mb'] - result['baseline_rss_mb']:.1f})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper/ETL/cache pipeline against local stand-ins")
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--stages', default=','.join(STAGES), help="comma-separated subset of stages")
+    parser.add_argument('--max-io-items', type=int, default=10000,
+                        help=f"cap for the {', '.join(sorted(CAPPED_STAGES))} stages")
+    parser.add_argument('--output', help=f"results file (default {RESULTS_DIR}/<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier results file to check for regressions")
+    parser.add_argument('--child', nargs=2, metavar=('STAGE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        stage, size = args.child
+        # Stage output goes to stderr; stdout carries only the JSON result
+        real_stdout, sys.stdout = sys.stdout, sys.stderr
+        result = run_stage(stage, int(size))
+        real_stdout.write(json.dumps(result) + '\n')
+        return
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    load_templates()
+
+    results = {}
+    print(f"🧪 Benchmarking {', '.join(stages)} at {', '.join(f'{size:,}' for size in args.sizes)} tools")
+    for size in args.sizes:
+        print(f"\n📦 {size:,} tools")
+        for stage in stages:
+            stage_size = min(size, args.max_io_items) if stage in CAPPED_STAGES else size
+            key = f'{stage}@{stage_size}'
+            if key in results:
+                continue
+            results[key] = run_isolated(stage, stage_size)
+            print_result(key, results[key])
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'createdAt': datetime.now().isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\n📄 Results written to {output}")
+
+    if args.compare:
+        if compare(results, args.compare):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_search_index.py
+import os
+import random
+import statistics
+import sys
+import time
+
+from bench_catalog import synthetic_catalog
+from search_index import (
+    build_search_index, publish_search_index, scan_search, search, search_index_payloads, search_redis,
+)
+
+def sample_queries(tools, count, seed=7):
+    """Words, phrases, prefixes and misses drawn from the catalog"""
+    rng = random.Random(seed)
+    queries = ['seo', 'ai', 'writing assistant', 'Marketing', 'video', 'zzzz-no-match', 'chat']
+    while len(queries) < count:
+        tool = rng.choice(tools)
+        words = (tool['tagline'] + ' ' + tool['name']).split()
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(rng.choice(words))
+        elif kind < 0.7:
+            start = rng.randrange(len(words))
+            queries.append(' '.join(words[start:start + 2]))
+        elif kind < 0.9:
+            queries.append(rng.choice(words)[:4])
+        else:
+            queries.append(rng.choice(tool.get('tags') or ['ai']))
+    return queries
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def bench_redis():
+    """Client for the published-index path: BENCH_REDIS_URL, else fakeredis, else None
+
+    fakeredis runs in process, so its timings include its own Python
+    overhead but no network; use a local redis-server for real numbers.
+    """
+    import importlib.util
+
+    url = os.getenv('BENCH_REDIS_URL')
+    if url:
+        import redis
+        return redis.Redis.from_url(url), url
+    if importlib.util.find_spec('fakeredis'):
+        import fakeredis
+        return fakeredis.FakeRedis(), 'fakeredis'
+    return None, None
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    for size in sizes:
+        tools = synthetic_catalog(size)
+        index, build_ms = timed_ms(lambda: build_search_index(tools))
+        docs, grams = search_index_payloads(index)
+        stored = sum(len(value.encode('utf-8')) for value in docs.values()) + sum(len(value) for value in grams.values())
+        queries = sample_queries(tools, 200)
+        redis_client, redis_name = bench_redis()
+        if redis_client is not None:
+            redis_client.flushdb()
+            _, publish_ms = timed_ms(lambda: publish_search_index(redis_client, index))
+
+        mismatches = 0
+        scan_times, index_times, redis_times = [], [], []
+        for query in queries:
+            expected, scan_ms = timed_ms(lambda: scan_search(tools, query, 0, 20))
+            actual, index_ms = timed_ms(lambda: search(index, query, 0, 20))
+            scan_times.append(scan_ms)
+            index_times.append(index_ms)
+            results = [actual]
+            if redis_client is not None:
+                published, redis_ms = timed_ms(lambda: search_redis(redis_client, query, 0, 20))
+                redis_times.append(redis_ms)
+                results.append(published)
+            if any(result != expected for result in results):
+                mismatches += 1
+                print(f"   ❌ Mismatch for {query!r}: {expected[0]} vs {[result and result[0] for result in results]} results")
+
+        def p95(times):
+            return statistics.quantiles(times, n=20)[-1]
+
+        print(f"📊 {size:,} tools: index built in {build_ms:.0f}ms, "
+              f"{len(index['postings']):,} trigrams, {stored / 1e6:.1f}MB stored")
+        print(f"   scan:      p50 {statistics.median(scan_times):8.2f}ms  p95 {p95(scan_times):8.2f}ms")
+        print(f"   in-memory: p50 {statistics.median(index_times):8.2f}ms  p95 {p95(index_times):8.2f}ms  (index already loaded)")
+        if redis_times:
+            print(f"   published: p50 {statistics.median(redis_times):8.2f}ms  p95 {p95(redis_times):8.2f}ms  "
+                  f"(search_redis per query on {redis_name}; published in {publish_ms:.0f}ms)")
+        else:
+            print("   published: skipped (set BENCH_REDIS_URL or install fakeredis)")
+        print(f"   {'✅ parity on all' if not mismatches else f'❌ {mismatches} mismatches in'} {len(queries)} queries")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_slugs.py
+import json
+import random
+import re
+import string
+import sys
+import time
+
+from slug_utils import generate_slug, generate_slugs
+
+def legacy_generate_slug(name):
+    """The three-pass implementation previously copied into every script"""
+    slug = name.lower()
+    slug = re.sub(r'[^a-z0-9 -]', '', slug)
+    slug = re.sub(r'\s+', '-', slug)
+    slug = re.sub(r'-+', '-', slug)
+    return slug.strip('-')
+
+def load_fixture_names():
+    """Tool names from mainData.txt plus hand-picked edge cases"""
+    names = [
+        '', ' ', '---', 'Copy.ai', 'Monday.com AI', 'DALL·E 2', 'Otter.ai',
+        '  Leading and trailing  ', 'Tabs\tand\nnewlines', 'Multi   space -- dash',
+        'ÜBER Tool', 'İstanbul AI', 'Straße', 'ＦＵＬＬＷＩＤＴＨ', 'emoji 🚀 rocket',
+        'a - b - c', '-x-', 'under_score', 'UPPER lower 123',
+    ]
+    try:
+        with open('mainData.txt', 'r', encoding='utf-8') as f:
+            names.extend(tool['name'] for tool in json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return names
+
+def random_names(count, seed=42):
+    """Random tool-like names mixing ASCII, punctuation, whitespace and unicode"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + '   --._&!\t' + 'éüßİΣ·🚀'
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+
+def check_conformance(names):
+    """Return names whose slug differs from the legacy implementation"""
+    expected = [legacy_generate_slug(name) for name in names]
+    mismatches = [n for n, e in zip(names, expected) if generate_slug(n) != e]
+    batch = generate_slugs(names)
+    mismatches.extend(n for n, e, b in zip(names, expected, batch) if b != e)
+    return mismatches
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed:8.3f}s  {count / elapsed / 1e6:6.2f}M names/s")
+    return elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    print("🔍 Checking conformance with legacy slug generator...")
+    sample = load_fixture_names() + random_names(200_000)
+    mismatches = check_conformance(sample)
+    if mismatches:
+        print(f"❌ {len(mismatches)} mismatches, e.g. {mismatches[:5]!r}")
+        sys.exit(1)
+    print(f"✅ {len(sample)} names produce identical slugs")
+
+    print(f"\n⏱️  Benchmarking over {count:,} names...")
+    names = random_names(count, seed=7)
+    legacy = timed('legacy (3x re.sub)', lambda: [legacy_generate_slug(n) for n in names], count)
+    single = timed('generate_slug', lambda: [generate_slug(n) for n in names], count)
+    batch = timed('generate_slugs (batch)', lambda: generate_slugs(names), count)
+    print(f"\n📈 Speedup: {legacy / single:.1f}x single, {legacy / batch:.1f}x batch")
+
+if __name__ == "__main__":
+    main()
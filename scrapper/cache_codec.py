@@ -0,0 +1,123 @@
+# cache_codec.py
+import os
+import json
+import zlib
+
+# Wire format for compressed cache values:
+#
+#   byte 0-2  magic b'\x00SC' (no JSON text can start with a NUL byte)
+#   byte 3    codec id: 1 = gzip (zlib stream with gzip header), 2 = zstd
+#   byte 4    schema version of the JSON inside (SCHEMA_VERSION)
+#   byte 5-   compressed UTF-8 JSON
+#
+# Values shorter than CACHE_COMPRESS_MIN_BYTES, and every value while
+# CACHE_CODEC=none (the default), are written as plain JSON text exactly as
+# before. Interop rules for readers (including the Node controllers):
+#   1. Read the value as raw bytes (node-redis: commandOptions({ returnBuffers: true })).
+#   2. If it does not start with the magic, it is plain UTF-8 JSON: JSON.parse it.
+#   3. Otherwise check byte 4 against the schema version you understand; treat
+#      a mismatch as a cache miss. Decompress the payload with the codec in
+#      byte 3 (zlib.gunzipSync for 1, a zstd binding for 2; unknown ids are a
+#      miss) and JSON.parse the result.
+# Enable compression only once every reader follows these rules.
+MAGIC = b'\x00SC'
+SCHEMA_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+
+CODEC_NONE = 'none'
+CODEC_GZIP = 'gzip'
+CODEC_ZSTD = 'zstd'
+CODEC_IDS = {CODEC_GZIP: 1, CODEC_ZSTD: 2}
+CODEC_NAMES = {codec_id: name for name, codec_id in CODEC_IDS.items()}
+
+def available_codecs():
+    """Compressing codecs usable here; zstd needs the optional zstandard package"""
+    codecs = [CODEC_GZIP]
+    try:
+        _zstd()
+        codecs.append(CODEC_ZSTD)
+    except ImportError:
+        pass
+    return codecs
+
+class CacheCodecError(ValueError):
+    """Raised for values with an unknown codec or schema version"""
+
+def _zstd():
+    import zstandard
+    return zstandard
+
+def _compress(codec, data, level):
+    if codec == CODEC_GZIP:
+        compressor = zlib.compressobj(level if level is not None else 6, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    if codec == CODEC_ZSTD:
+        return _zstd().ZstdCompressor(level=level if level is not None else 3).compress(data)
+    raise CacheCodecError(f"unknown codec {codec!r}")
+
+def _decompress(codec, data):
+    if codec == CODEC_GZIP:
+        return zlib.decompress(data, 31)
+    if codec == CODEC_ZSTD:
+        return _zstd().ZstdDecompressor().decompress(data)
+    raise CacheCodecError(f"unknown codec {codec!r}")
+
+class CacheCodec:
+    """Encodes JSON text for Redis, compressing values above a size threshold"""
+
+    def __init__(self, codec=CODEC_NONE, min_bytes=1024, level=None):
+        if codec != CODEC_NONE and codec not in CODEC_IDS:
+            raise CacheCodecError(f"unknown codec {codec!r}")
+        self.codec = codec
+        self.min_bytes = min_bytes
+        self.level = level
+
+    @classmethod
+    def from_env(cls):
+        """CACHE_CODEC (none|gzip|zstd), CACHE_COMPRESS_MIN_BYTES and CACHE_COMPRESS_LEVEL"""
+        level = os.getenv('CACHE_COMPRESS_LEVEL')
+        return cls(
+            codec=os.getenv('CACHE_CODEC', CODEC_NONE).lower(),
+            min_bytes=int(os.getenv('CACHE_COMPRESS_MIN_BYTES', '1024')),
+            level=int(level) if level else None,
+        )
+
+    def encode(self, text):
+        """Return text unchanged, or header + compressed bytes when it is large enough"""
+        if self.codec == CODEC_NONE:
+            return text
+        data = text.encode('utf-8')
+        if len(data) < self.min_bytes:
+            return text
+        header = MAGIC + bytes((CODEC_IDS[self.codec], SCHEMA_VERSION))
+        return header + _compress(self.codec, data, self.level)
+
+    def dumps(self, obj, **kwargs):
+        return self.encode(json.dumps(obj, **kwargs))
+
+def stored_size(value):
+    """Bytes Redis stores for an encode() result, str (UTF-8) or bytes"""
+    return len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+
+def decode(raw):
+    """Return the JSON text of a cache value written by any CacheCodec"""
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        return raw
+    if not raw.startswith(MAGIC):
+        return raw.decode('utf-8')
+    if len(raw) < HEADER_SIZE:
+        raise CacheCodecError("truncated header")
+    codec_id, schema_version = raw[3], raw[4]
+    if schema_version != SCHEMA_VERSION:
+        raise CacheCodecError(f"unsupported schema version {schema_version}")
+    codec = CODEC_NAMES.get(codec_id)
+    if codec is None:
+        raise CacheCodecError(f"unknown codec id {codec_id}")
+    return _decompress(codec, raw[HEADER_SIZE:]).decode('utf-8')
+
+def loads(raw):
+    """Decode and parse a cache value; None stays None"""
+    text = decode(raw)
+    return None if text is None else json.loads(text)
@@ -0,0 +1,287 @@
+# cache_verifier.py
+import re
+import json
+import hashlib
+import argparse
+import traceback
+import cache_codec
+from cache_codec import CacheCodec
+from connections import get_db, get_redis_client
+from metrics import Metrics
+from refresh_redis_cache import DateTimeEncoder, convert_mongo_doc
+from tool_cache import SLUG_LAYOUT_COPY, SLUG_MAP_KEY, map_slug, slug_layout
+from profiling import add_profile_arguments, profiled
+
+TOOL_PREFIX = 'tool:'
+SLUG_PREFIX = 'tool:slug:'
+BATCH_SIZE = 500
+EXAMPLES = 10
+
+# Node writes JSON.stringify(doc) (dates as ...T00:00:00.000Z, 5 for 5.0);
+# the Python refresh writes isoformat() and 5.0. Both normalise to the same hash.
+_ISO_DATE = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(?:Z|\+00:00)?$')
+
+# Mongoose fills these schema defaults (models/toolModel.js) into the
+# documents the backend caches, while Python caches the stored document.
+# Both sides get them filled in, and empty lists/objects (tags: [],
+# visual.content: []) dropped, before hashing.
+TOOL_DEFAULTS = {
+    'status': 'pending',
+    'isFeatured': False,
+    'logoUrl': '',
+    'source': 'listed',
+    'totalRatingSum': 0,
+    'numberOfRatings': 0,
+    'averageRating': 0,
+    'trendingScore': 0,
+    'analytics': {
+        'totalViews': 0,
+        'uniqueViews': 0,
+        'weeklyViews': 0,
+        'monthlyViews': 0,
+        'totalClicks': 0,
+        'weeklyClicks': 0,
+        'monthlyClicks': 0,
+    },
+    'commentStats': {'totalComments': 0, 'approvedComments': 0},
+    'mediaStats': {'totalMedia': 0, 'screenshots': 0, 'videos': 0},
+}
+
+def _with_defaults(doc, defaults=TOOL_DEFAULTS):
+    doc = dict(doc)
+    for key, default in defaults.items():
+        if isinstance(default, dict):
+            if isinstance(doc.get(key, {}), dict):
+                doc[key] = _with_defaults(doc.get(key) or {}, default)
+        elif key not in doc:
+            doc[key] = default
+    return doc
+
+def _prune(value):
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in ([], {})}
+    if isinstance(value, list):
+        return [_prune(item) for item in value]
+    return value
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        match = _ISO_DATE.match(value)
+        if match:
+            return f"{match.group(1)}.{(match.group(2) or '').ljust(3, '0')[:3]}"
+    return value
+
+def content_hash(doc):
+    """Hash of a tool document that ignores key order, schema defaults and Node/Python formatting"""
+    text = json.dumps(_canonical(_prune(_with_defaults(doc))), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def _cached_hash(raw):
+    try:
+        return content_hash(cache_codec.loads(raw))
+    except Exception:
+        return 'unreadable'
+
+class Findings:
+    """Drift found so far, with a few example keys per kind"""
+
+    KINDS = ('stale', 'missing', 'orphaned', 'slug_map')
+
+    def __init__(self):
+        self.keys = {kind: [] for kind in self.KINDS}
+        self.checked_tools = 0
+        self.checked_keys = 0
+
+    def add(self, kind, key, expected=None):
+        self.keys[kind].append((key, expected))
+
+    def report(self):
+        print(f"\n📋 Checked {self.checked_tools} tools and {self.checked_keys} cached keys")
+        for kind in self.KINDS:
+            entries = self.keys[kind]
+            print(f"   {'✅' if not entries else '⚠️ '} {kind}: {len(entries)}")
+            for key, _ in entries[:EXAMPLES]:
+                print(f"      - {key}")
+
+def _tool_keys(tool):
+    keys = [f"{TOOL_PREFIX}{tool['_id']}"]
+    if tool.get('slug'):
+        keys.append(f"{SLUG_PREFIX}{tool['slug']}")
+    return keys
+
+def check_tools(raw_client, tools, findings, codec, keep_missing=False, layout=SLUG_LAYOUT_COPY):
+    """Compare the cached copies of a batch of approved tools with Mongo
+
+    tool:{id} and tool:slug:{slug} are checked under either layout, and
+    the tool:slugs entry under the hash layout. There the backend still
+    caches full copies under tool:slug:{slug} on a miss, so those are
+    checked for staleness but never reported missing. The value to repair
+    with is kept for stale keys, and for missing keys only when
+    keep_missing is set, since most tools may be missing by design.
+    """
+    converted = [convert_mongo_doc(tool) for tool in tools]
+    keys = [key for tool in converted for key in _tool_keys(tool)]
+    values = dict(zip(keys, raw_client.mget(keys))) if keys else {}
+
+    if layout != SLUG_LAYOUT_COPY:
+        slugged = [tool for tool in converted if tool.get('slug')]
+        mapped = raw_client.hmget(SLUG_MAP_KEY, [tool['slug'] for tool in slugged]) if slugged else []
+        for tool, tool_id in zip(slugged, mapped):
+            if tool_id is None or tool_id.decode('utf-8') != tool['_id']:
+                findings.add('slug_map', tool['slug'], tool['_id'])
+
+    for tool in converted:
+        expected_hash = content_hash(tool)
+        expected = None
+        for key in _tool_keys(tool):
+            raw = values.get(key)
+            if raw is None and layout != SLUG_LAYOUT_COPY and key.startswith(SLUG_PREFIX):
+                continue
+            if raw is None:
+                kind = 'missing'
+            elif _cached_hash(raw) != expected_hash:
+                kind = 'stale'
+            else:
+                continue
+            if kind == 'missing' and not keep_missing:
+                findings.add(kind, key)
+                continue
+            if expected is None:
+                expected = codec.encode(json.dumps(tool, cls=DateTimeEncoder))
+            findings.add(kind, key, expected)
+    findings.checked_tools += len(tools)
+
+def check_keys(db, keys, findings):
+    """Flag cached tool keys whose tool is gone, unapproved or has been renamed"""
+    from bson import ObjectId
+
+    keys = [key.decode('utf-8') if isinstance(key, bytes) else key for key in keys]
+    ids = {}
+    slugs = {}
+    for key in keys:
+        if key.startswith(SLUG_PREFIX):
+            slugs[key[len(SLUG_PREFIX):]] = key
+        elif ObjectId.is_valid(key[len(TOOL_PREFIX):]):
+            ids[ObjectId(key[len(TOOL_PREFIX):])] = key
+
+    live = db.tools.find(
+        {'status': 'approved', '$or': [{'_id': {'$in': list(ids)}}, {'slug': {'$in': list(slugs)}}]},
+        {'slug': 1},
+    )
+    live_ids = set()
+    live_slugs = set()
+    for tool in live:
+        live_ids.add(tool['_id'])
+        live_slugs.add(tool.get('slug'))
+    for tool_id, key in ids.items():
+        if tool_id not in live_ids:
+            findings.add('orphaned', key)
+    for slug, key in slugs.items():
+        if slug not in live_slugs:
+            findings.add('orphaned', key)
+    findings.checked_keys += len(keys)
+
+def scan_tool_keys(raw_client, limit=None, batch_size=BATCH_SIZE):
+    """Yield batches of tool:* keys from SCAN, stopping after limit keys"""
+    batch = []
+    seen = 0
+    for key in raw_client.scan_iter(match=f'{TOOL_PREFIX}*', count=1000):
+        batch.append(key)
+        seen += 1
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+        if limit is not None and seen >= limit:
+            break
+    if batch:
+        yield batch
+
+def repair(raw_client, findings, include_missing=False):
+    """Rewrite stale keys (keeping their TTL), delete orphans and optionally fill missing keys"""
+    pipe = raw_client.pipeline(transaction=False)
+    repaired = 0
+    for key, expected in findings.keys['stale']:
+        pipe.set(key, expected, keepttl=True)
+        repaired += 1
+    if include_missing:
+        for key, expected in findings.keys['missing']:
+            pipe.setex(key, 3600, expected)
+            repaired += 1
+    orphans = [key for key, _ in findings.keys['orphaned']]
+    for start in range(0, len(orphans), BATCH_SIZE):
+        pipe.unlink(*orphans[start:start + BATCH_SIZE])
+    pipe.execute()
+    # Guarded, so an expired map is left for the next refresh rather than recreated without a TTL
+    for slug, tool_id in findings.keys['slug_map']:
+        repaired += map_slug(raw_client, slug, tool_id)
+    return repaired, len(orphans)
+
+def verify_cache(sample=None, fix=False, include_missing=False):
+    """Compare cached tool keys against MongoDB; sample=None checks everything"""
+
+    metrics = Metrics('verify_cache')
+    findings = Findings()
+
+    try:
+        db = get_db()
+        raw_client = get_redis_client(decode_responses=False)
+        codec = CacheCodec.from_env()
+        layout = slug_layout()
+        mode = f"sample of {sample}" if sample else "full audit"
+        print(f"🔍 Verifying tool cache ({mode})...")
+
+        approved = {'status': 'approved'}
+        if sample:
+            tools_iter = db.tools.aggregate([{'$match': approved}, {'$sample': {'size': sample}}])
+        else:
+            tools_iter = db.tools.find(approved).sort('_id', 1).batch_size(BATCH_SIZE)
+
+        batch = []
+        for tool in tools_iter:
+            batch.append(tool)
+            if len(batch) == BATCH_SIZE:
+                with metrics.timer('check_tools'):
+                    check_tools(raw_client, batch, findings, codec, fix and include_missing, layout)
+                metrics.progress('tools', findings.checked_tools)
+                batch = []
+        if batch:
+            with metrics.timer('check_tools'):
+                check_tools(raw_client, batch, findings, codec, fix and include_missing, layout)
+
+        for keys in scan_tool_keys(raw_client, limit=sample):
+            with metrics.timer('check_keys'):
+                check_keys(db, keys, findings)
+            metrics.progress('keys', findings.checked_keys)
+
+        for kind in Findings.KINDS:
+            metrics.incr(kind, len(findings.keys[kind]))
+        findings.report()
+        print("   ℹ️  Missing keys are expected for tools outside the warm-up hot set")
+
+        if fix:
+            with metrics.timer('repair'):
+                rewritten, deleted = repair(raw_client, findings, include_missing)
+            print(f"🔧 Rewrote {rewritten} keys and deleted {deleted} orphaned keys")
+        return findings
+
+    except Exception as e:
+        print(f"❌ Error verifying cache: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Check cached tool keys against MongoDB"))
+    parser.add_argument('--sample', type=int, default=None, help="check a random sample instead of a full audit")
+    parser.add_argument('--fix', action='store_true', help="rewrite stale keys and delete orphaned ones")
+    parser.add_argument('--include-missing', action='store_true', help="with --fix, also cache missing tools")
+    args = parser.parse_args()
+    with profiled('verify_cache', args.profile, args.profile_dir):
+        verify_cache(sample=args.sample, fix=args.fix, include_missing=args.include_missing)
@@ -0,0 +1,17 @@
+# checkpoints.py
+from datetime import datetime, timezone
+
+CHECKPOINTS_COLLECTION = 'checkpoints'
+
+def get_checkpoint(db, name, default=None):
+    """Last saved position of an incremental job, or default on its first run"""
+    doc = db[CHECKPOINTS_COLLECTION].find_one({'_id': name})
+    return doc['position'] if doc else default
+
+def save_checkpoint(db, name, position, **extra):
+    """Record how far an incremental job has got; extra fields are kept for reporting"""
+    db[CHECKPOINTS_COLLECTION].update_one(
+        {'_id': name},
+        {'$set': {'position': position, 'updatedAt': datetime.now(timezone.utc), **extra}},
+        upsert=True,
+    )
@@ -0,0 +1,51 @@
+# cli.py
+import sys
+import runpy
+import argparse
+
+# Subcommand -> (module whose __main__ block runs it, description). Modules
+# are only imported once a subcommand is chosen, so `cli.py refresh` never
+# pays for bs4, requests or cloudinary, and `cli.py --help` for none of them.
+COMMANDS = {
+    'scrape': ('scrapper', "scrape AI tools from multiple sources"),
+    'clean': ('clean_data', "clean scraped tools into mainData.txt"),
+    'upload': ('upload_to_mongo', "upload mainData.txt tools to MongoDB"),
+    'logos': ('download_tool_logos', "download logos for the scraped tools"),
+    'upload-logos': ('upload_logo', "upload logos to Cloudinary and store their URLs"),
+    'pipeline': ('pipeline', "scrape, clean, upload, fetch logos and refresh in one process"),
+    'refresh': ('refresh_redis_cache', "refresh the Redis cache, or one tool with --tool"),
+    'refresh-daemon': ('refresh_daemon', "keep the Redis cache warm on a schedule"),
+    'verify-cache': ('cache_verifier', "check cached tool keys against MongoDB"),
+    'memory': ('redis_memory', "report Redis memory per cache key family"),
+    'rollup': ('analytics_rollup', "roll up tool views and clicks into tools.analytics"),
+    'toolstats': ('toolstats', "aggregate views and clicks into toolstats buckets"),
+    'unique-visitors': ('unique_visitors', "maintain per-tool unique-visitor sketches"),
+    'trending': ('trending', "compute and publish trending scores"),
+    'ratings': ('recompute_ratings', "recompute tool ratings from the ratings collection"),
+    'comment-stats': ('comment_stats', "maintain tools.commentStats"),
+    'fix-null-ratings': ('fix_null_ratings', "set null tool rating fields to zero"),
+    'fix-scraped-tools': ('fix_scraped_tools', "set submittedBy on scraped tools"),
+}
+
+def build_parser():
+    width = max(len(name) for name in COMMANDS)
+    commands = '\n'.join(f"  {name:<{width}}  {help_text}" for name, (_, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Run a scrapper job; `cli.py <command> --help` shows its options",
+        epilog=f"commands:\n{commands}",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('command', choices=COMMANDS, metavar='command')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    module, _ = COMMANDS[args.command]
+    # The job parses its own options, so make it see `cli.py <command> ...`
+    sys.argv = [f'cli.py {args.command}', *args.args]
+    runpy.run_module(module, run_name='__main__')
+
+if __name__ == "__main__":
+    main()
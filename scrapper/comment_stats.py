@@ -0,0 +1,115 @@
+# comment_stats.py
+import argparse
+import traceback
+from datetime import datetime, timedelta, timezone
+from checkpoints import get_checkpoint, save_checkpoint
+from connections import get_db
+from metrics import Metrics
+from profiling import add_profile_arguments, profiled
+
+CHECKPOINT_NAME = 'comment_stats'
+
+# Matches commentController.js: new comments are approved, reporting one
+# moves it to reported (still counted, no longer approved), and deleting one
+# with replies leaves it as deleted (no longer counted)
+COUNTED_STATUSES = ['approved', 'pending', 'reported']
+APPROVED_STATUS = 'approved'
+
+# Re-read a little before the checkpoint so comments saved in the same
+# instant as the last run are not missed
+CHECKPOINT_OVERLAP = timedelta(minutes=1)
+
+ZERO_STATS = {'totalComments': 0, 'approvedComments': 0, 'lastCommentAt': None}
+
+def comment_stats_pipeline(tool_ids=None):
+    """Per-tool totalComments, approvedComments and lastCommentAt"""
+    match = {'status': {'$in': COUNTED_STATUSES}}
+    if tool_ids is not None:
+        match['tool'] = {'$in': tool_ids}
+    return [
+        {'$match': match},
+        {'$group': {
+            '_id': '$tool',
+            'totalComments': {'$sum': 1},
+            'approvedComments': {'$sum': {'$cond': [{'$eq': ['$status', APPROVED_STATUS]}, 1, 0]}},
+            'lastCommentAt': {'$max': '$createdAt'},
+        }},
+    ]
+
+def comment_stat_operations(tools, stats):
+    """UpdateOne for each tool whose commentStats differ from the recomputed ones"""
+    from pymongo import UpdateOne
+
+    operations = []
+    for tool in tools:
+        row = stats.get(tool['_id'], ZERO_STATS)
+        wanted = {field: row[field] for field in ZERO_STATS}
+        current = tool.get('commentStats') or {}
+        if any(current.get(field) != value for field, value in wanted.items()):
+            operations.append(UpdateOne(
+                {'_id': tool['_id']},
+                {'$set': {f'commentStats.{field}': value for field, value in wanted.items()}},
+            ))
+    return operations
+
+def update_comment_stats(full=False, dry_run=False):
+    """Recompute commentStats for tools whose comments changed since the last run
+
+    Changes are found through comments.updatedAt. Hard-deleted comments
+    leave nothing behind, so a tool only affected by deletions is picked up
+    by the next --full run (commentController already decrements its counts).
+    """
+
+    metrics = Metrics('update_comment_stats')
+
+    try:
+        db = get_db()
+        started = datetime.now(timezone.utc).replace(tzinfo=None)
+        checkpoint = None if full else get_checkpoint(db, CHECKPOINT_NAME)
+
+        if checkpoint is None:
+            tool_filter = {}
+            tool_ids = None
+            print("🔄 Recomputing comment stats for every tool...")
+        else:
+            with metrics.timer('changed_tools'):
+                tool_ids = db.comments.distinct('tool', {'updatedAt': {'$gte': checkpoint - CHECKPOINT_OVERLAP}})
+            tool_filter = {'_id': {'$in': tool_ids}}
+            print(f"🔄 {len(tool_ids)} tools have comment changes since {checkpoint.isoformat()}")
+
+        if tool_ids == []:
+            save_checkpoint(db, CHECKPOINT_NAME, started, tools=0)
+            print("✅ Comment stats already up to date")
+            return
+
+        with metrics.timer('comments_aggregate'):
+            stats = {row['_id']: row for row in db.comments.aggregate(comment_stats_pipeline(tool_ids), allowDiskUse=True)}
+        with metrics.timer('tools_fetch'):
+            tools = db.tools.find(tool_filter, {'commentStats': 1})
+            operations = comment_stat_operations(tools, stats)
+        metrics.incr('tools_changed', len(operations))
+        print(f"💬 {len(operations)} tools need updated comment stats")
+
+        if dry_run:
+            print("🧪 Dry run: nothing written")
+            return
+
+        if operations:
+            with metrics.timer('bulk_write'):
+                db.tools.bulk_write(operations, ordered=False)
+        save_checkpoint(db, CHECKPOINT_NAME, started, tools=len(operations))
+        print(f"✅ Updated comment stats on {len(operations)} tools")
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Backfill and maintain tools.commentStats from comments"))
+    parser.add_argument('--full', action='store_true', help="ignore the checkpoint and check every tool")
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    with profiled('update_comment_stats', args.profile, args.profile_dir):
+        update_comment_stats(full=args.full, dry_run=args.dry_run)
@@ -0,0 +1,152 @@
+# connections.py
+import os
+import atexit
+import importlib.util
+from dotenv import load_dotenv
+
+# Same variable names as the Node backend (config/db.js), read from .env when present
+load_dotenv()
+
+# No defaults: credentials come from the environment only, and a missing
+# one fails on first use (see require_env)
+MONGO_URI = os.getenv('MONGO_URI')
+REDIS_URL = os.getenv('REDIS_URL')
+MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'seohub')
+
+# Wire compressors in order of preference, and the module each one needs
+_COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+_READ_PREFERENCES = {
+    'primary': 'Primary',
+    'primarypreferred': 'PrimaryPreferred',
+    'secondary': 'Secondary',
+    'secondarypreferred': 'SecondaryPreferred',
+    'nearest': 'Nearest',
+}
+
+_mongo_clients = {}
+_redis_pools = {}
+
+def require_env(name, value=None):
+    """Return value, else the environment variable name; fail clearly if neither is set"""
+    value = value or os.getenv(name)
+    if not value:
+        raise RuntimeError(f"{name} is not set; add it to the environment or scrapper/.env")
+    return value
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def available_compressors():
+    """Compressors from MONGO_COMPRESSORS whose Python module is installed"""
+    wanted = os.getenv('MONGO_COMPRESSORS', 'zstd,snappy,zlib')
+    names = [name.strip() for name in wanted.split(',') if name.strip()]
+    return [
+        name for name in names
+        if name in _COMPRESSOR_MODULES and importlib.util.find_spec(_COMPRESSOR_MODULES[name])
+    ]
+
+def mongo_options():
+    """Pool, timeout and compression settings for MongoClient"""
+    options = {
+        'maxPoolSize': _env_int('MONGO_MAX_POOL_SIZE', 20),
+        'minPoolSize': _env_int('MONGO_MIN_POOL_SIZE', 0),
+        'maxIdleTimeMS': _env_int('MONGO_MAX_IDLE_TIME_MS', 60000),
+        'connectTimeoutMS': _env_int('MONGO_CONNECT_TIMEOUT_MS', 10000),
+        'serverSelectionTimeoutMS': _env_int('MONGO_SERVER_SELECTION_TIMEOUT_MS', 10000),
+        'socketTimeoutMS': _env_int('MONGO_SOCKET_TIMEOUT_MS', 120000),
+        'appname': os.getenv('MONGO_APP_NAME', 'seohub-scrapper'),
+    }
+    compressors = available_compressors()
+    if compressors:
+        options['compressors'] = ','.join(compressors)
+    return options
+
+def redis_options():
+    """Pool and timeout settings for the Redis connection pool"""
+    return {
+        'max_connections': _env_int('REDIS_MAX_CONNECTIONS', 20),
+        'socket_connect_timeout': _env_int('REDIS_CONNECT_TIMEOUT_MS', 10000) / 1000,
+        'socket_timeout': _env_int('REDIS_SOCKET_TIMEOUT_MS', 30000) / 1000,
+        'health_check_interval': _env_int('REDIS_HEALTH_CHECK_INTERVAL', 30),
+    }
+
+def get_mongo_client(uri=None):
+    """Return a shared MongoClient for uri, connecting and pinging on first use"""
+    import pymongo
+
+    uri = uri or MONGO_URI
+    client = _mongo_clients.get(uri)
+    if client is None:
+        uri = require_env('MONGO_URI', uri)
+        print("📊 Connecting to MongoDB...")
+        client = pymongo.MongoClient(uri, **mongo_options())
+        try:
+            client.admin.command('ping')
+        except Exception:
+            client.close()
+            raise
+        _mongo_clients[uri] = client
+        print("✅ Connected to MongoDB successfully!")
+    return client
+
+def get_db(name=None, read_preference=None, uri=None):
+    """Return the seohub database on the shared client
+
+    read_preference is one of primary, primaryPreferred, secondary,
+    secondaryPreferred or nearest; defaults to MONGO_READ_PREFERENCE.
+    """
+    from pymongo import read_preferences
+
+    client = get_mongo_client(uri)
+    read_preference = read_preference or os.getenv('MONGO_READ_PREFERENCE')
+    if read_preference:
+        mode = _READ_PREFERENCES[read_preference.lower()]
+        return client.get_database(name or MONGO_DB_NAME, read_preference=getattr(read_preferences, mode)())
+    return client.get_database(name or MONGO_DB_NAME)
+
+def get_redis_client(url=None, decode_responses=True):
+    """Return a Redis client backed by a shared connection pool for url"""
+    import redis
+
+    url = url or REDIS_URL
+    key = (url, decode_responses)
+    pool = _redis_pools.get(key)
+    if pool is None:
+        url = require_env('REDIS_URL', url)
+        print("🔌 Connecting to Redis...")
+        pool = redis.ConnectionPool.from_url(url, decode_responses=decode_responses, **redis_options())
+        client = redis.Redis(connection_pool=pool)
+        try:
+            client.ping()
+        except Exception:
+            pool.disconnect()
+            raise
+        _redis_pools[key] = pool
+        print("✅ Connected to Redis successfully!")
+        return client
+    return redis.Redis(connection_pool=pool)
+
+def install_stand_ins(mongo_client=None, redis_pool=None):
+    """Serve get_db/get_redis_client from local stand-ins, e.g. for benchmarks
+
+    mongo_client (a mongomock.MongoClient, say) is returned for MONGO_URI;
+    redis_pool(decode_responses) builds the ConnectionPool for REDIS_URL.
+    """
+    if mongo_client is not None:
+        _mongo_clients[MONGO_URI] = mongo_client
+    if redis_pool is not None:
+        for decode_responses in (True, False):
+            _redis_pools[(REDIS_URL, decode_responses)] = redis_pool(decode_responses)
+
+def close_all():
+    """Close every shared Mongo client and Redis pool"""
+    while _mongo_clients:
+        _, client = _mongo_clients.popitem()
+        client.close()
+    while _redis_pools:
+        _, pool = _redis_pools.popitem()
+        pool.disconnect()
+
+atexit.register(close_all)
@@ -1,19 +1,13 @@
 # download_tool_logos.py
 import os
-import re
 import json
-import requests
+import argparse
 import time
 from urllib.parse import urlparse
 from pathlib import Path
-
-def generate_slug(name):
-    """Generate URL-friendly slug from tool name - same as upload_to_mongo.py"""
-    slug = name.lower()
-    slug = re.sub(r'[^a-z0-9 -]', '', slug)
-    slug = re.sub(r'\s+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
-    return slug.strip('-')
+from slug_utils import generate_slug
+from metrics import Metrics
+from profiling import add_profile_arguments, phase, profiled
 
 def extract_domain(url):
     """Extract clean domain from URL"""
@@ -27,24 +21,37 @@ def extract_domain(url):
     except:
         return None
 
-def download_logo(url, file_path, timeout=10):
+def download_logo(url, file_path, timeout=10, metrics=None):
     """Download logo from URL and save to file_path"""
+    import requests
+
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=timeout)
+        start = time.perf_counter()
+        try:
+            with phase('fetch'):
+                response = requests.get(url, headers=headers, timeout=timeout)
+        finally:
+            if metrics:
+                metrics.observe('http_fetch', time.perf_counter() - start)
         
         if response.status_code == 200:
             # Check if response contains actual image data
             content_type = response.headers.get('content-type', '').lower()
             if 'image' in content_type or len(response.content) > 1000:  # Assume files > 1KB are likely images
-                with open(file_path, 'wb') as f:
+                with phase('write'), open(file_path, 'wb') as f:
                     f.write(response.content)
                 return True
+        if metrics:
+            metrics.incr(f'http_status_{response.status_code}')
         return False
     except Exception as e:
-        print(f"   ❌ Error downloading {url}: {str(e)}")
+        if metrics:
+            metrics.incr('http_errors')
+        else:
+            print(f"   ❌ Error downloading {url}: {str(e)}")
         return False
 
 def clean_and_parse_tools_data(file_path):
@@ -138,6 +145,62 @@ def try_multiple_logo_sources(tool_name, website_url, slug):
     
     return logo_sources
 
+def download_tool_logo(tool, logo_dir, index=1, metrics=None, slug=None):
+    """Download the logo for one tool, trying each source until one works
+
+    slug defaults to the one generated from the name; pass the slug the
+    tool was stored under when it may carry a -N suffix.
+    """
+    metrics = metrics or Metrics('download_tool_logo', dump=False)
+    tool_name = tool.get('name', f'Tool_{index}')
+    website_url = tool.get('websiteUrl', '')
+    slug = slug or generate_slug(tool_name)
+    
+    if not website_url:
+        metrics.incr('no_website_url')
+        return {
+            'name': tool_name,
+            'slug': slug,
+            'status': 'no_website_url',
+            'website_url': website_url
+        }
+    
+    # Try multiple logo sources
+    logo_sources = try_multiple_logo_sources(tool_name, website_url, slug)
+    file_path = os.path.join(logo_dir, f'{slug}.png')
+    
+    for source in logo_sources:
+        metrics.incr('sources_tried')
+        success = download_logo(source['url'], file_path, metrics=metrics)
+        
+        if success:
+            # Verify the downloaded file is not too small (likely an error page)
+            file_size = os.path.getsize(file_path)
+            if file_size > 500:  # At least 500 bytes
+                metrics.incr('downloaded')
+                metrics.incr('bytes_downloaded', file_size)
+                return {
+                    'name': tool_name,
+                    'slug': slug,
+                    'status': 'downloaded',
+                    'source': source['name'],
+                    'source_url': source['url'],
+                    'file_size': file_size,
+                    'file_path': file_path,
+                    'website_url': website_url
+                }
+            # File too small, probably an error - delete it
+            os.remove(file_path)
+            metrics.incr('too_small')
+    
+    metrics.incr('failed_all_sources')
+    return {
+        'name': tool_name,
+        'slug': slug,
+        'status': 'failed_all_sources',
+        'website_url': website_url
+    }
+
 def download_tool_logos():
     """Main function to download logos for all tools"""
     print("🚀 Starting Tool Logo Downloader...")
@@ -158,7 +221,8 @@ def download_tool_logos():
     for file_name in possible_files:
         if os.path.exists(file_name):
             print(f"📄 Found data file: {file_name}")
-            tools_data = clean_and_parse_tools_data(file_name)
+            with phase('transform'):
+                tools_data = clean_and_parse_tools_data(file_name)
             if tools_data:
                 break
     
@@ -179,73 +243,24 @@ def download_tool_logos():
     
     print(f"\n🔽 Starting download for {len(tools_data)} tools...\n")
     
+    metrics = Metrics('download_tool_logos')
+    
     for i, tool in enumerate(tools_data, 1):
-        tool_name = tool.get('name', f'Tool_{i}')
-        website_url = tool.get('websiteUrl', '')
-        slug = generate_slug(tool_name)
+        with metrics.timer('tool_total'):
+            result = download_tool_logo(tool, logo_dir, i, metrics)
+        results.append(result)
+        metrics.progress('Tools processed', i, len(tools_data))
         
-        print(f"[{i:2d}/{len(tools_data)}] Processing: {tool_name}")
-        print(f"   🔗 Website: {website_url}")
-        print(f"   📝 Slug: {slug}")
-        
-        if not website_url:
-            print(f"   ⚠️  No website URL provided")
-            results.append({
-                'name': tool_name,
-                'slug': slug,
-                'status': 'no_website_url',
-                'website_url': website_url
-            })
+        if result['status'] == 'downloaded':
+            successful_downloads += 1
+        else:
             failed_downloads += 1
-            continue
-        
-        # Try multiple logo sources
-        logo_sources = try_multiple_logo_sources(tool_name, website_url, slug)
-        logo_downloaded = False
-        
-        for source in logo_sources:
-            if logo_downloaded:
-                break
-                
-            file_path = os.path.join(logo_dir, f'{slug}.png')
-            print(f"   🔍 Trying {source['name']}: {source['url']}")
-            
-            success = download_logo(source['url'], file_path)
-            
-            if success:
-                # Verify the downloaded file is not too small (likely an error page)
-                file_size = os.path.getsize(file_path)
-                if file_size > 500:  # At least 500 bytes
-                    print(f"   ✅ Downloaded from {source['name']} ({file_size} bytes)")
-                    logo_downloaded = True
-                    successful_downloads += 1
-                    results.append({
-                        'name': tool_name,
-                        'slug': slug,
-                        'status': 'downloaded',
-                        'source': source['name'],
-                        'source_url': source['url'],
-                        'file_size': file_size,
-                        'website_url': website_url
-                    })
-                else:
-                    # File too small, probably an error - delete it
-                    os.remove(file_path)
-                    print(f"   ⚠️  File too small from {source['name']}, trying next source...")
         
-        if not logo_downloaded:
-            print(f"   ❌ Failed to download logo from any source")
-            failed_downloads += 1
-            results.append({
-                'name': tool_name,
-                'slug': slug,
-                'status': 'failed_all_sources',
-                'website_url': website_url
-            })
+        if result['status'] == 'no_website_url':
+            continue
         
         # Add small delay to be respectful to servers
         time.sleep(0.5)
-        print()
     
     # Generate summary report
     print("="*60)
@@ -285,8 +300,12 @@ def download_tool_logos():
             if result['status'] != 'downloaded':
                 print(f"   {result['slug']} - {result['name']} ({result['status']})")
     
+    metrics.report()
     print(f"\n🎉 Logo download process completed!")
     return results
 
 if __name__ == "__main__":
-    results = download_tool_logos()
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Download logos for the scraped tools"))
+    args = parser.parse_args()
+    with profiled('download_tool_logos', args.profile, args.profile_dir):
+        results = download_tool_logos()
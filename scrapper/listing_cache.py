@@ -0,0 +1,114 @@
+# listing_cache.py
+import json
+
+# Each listing is a Redis list of tool ids in (isFeatured desc, createdAt desc)
+# order, so any page is one LRANGE. Because featured tools sort first, the
+# featured subset of a listing is always its first `featured` entries.
+LISTING_PREFIX = 'listing:'
+LISTING_META_KEY = 'listing:meta'
+ALL_LISTING = 'all'
+
+def listing_key(kind, value=None):
+    """listing:all, listing:tag:{tag} or listing:category:{category}"""
+    if value is None:
+        return f'{LISTING_PREFIX}{kind}'
+    return f'{LISTING_PREFIX}{kind}:{value.strip().lower()}'
+
+def build_listings(tools):
+    """Map listing key -> ordered tool ids
+
+    tools must be in (isFeatured desc, createdAt desc) order. tag listings
+    hold tools carrying the tag; category listings follow applyFilters and
+    hold tools with any tag containing the category as a substring. Every
+    distinct tag is also precomputed as a category.
+    """
+    tool_tags = []
+    all_tags = set()
+    for tool in tools:
+        tags = {tag.strip().lower() for tag in tool.get('tags') or [] if tag and tag.strip()}
+        tool_tags.append(tags)
+        all_tags |= tags
+
+    # Which category listings each distinct tag belongs to (substring match).
+    # Enumerating a tag's substrings keeps this linear in the number of tags.
+    tag_categories = {}
+    for tag in all_tags:
+        substrings = {tag[i:j] for i in range(len(tag)) for j in range(i + 1, len(tag) + 1)}
+        tag_categories[tag] = substrings & all_tags
+
+    listings = {listing_key(ALL_LISTING): []}
+    for tool, tags in zip(tools, tool_tags):
+        tool_id = str(tool['_id'])
+        listings[listing_key(ALL_LISTING)].append(tool_id)
+        categories = set()
+        for tag in tags:
+            listings.setdefault(listing_key('tag', tag), []).append(tool_id)
+            categories.update(tag_categories[tag])
+        for category in categories:
+            listings.setdefault(listing_key('category', category), []).append(tool_id)
+    return listings
+
+def _staging_key(key):
+    # listing:staging:... never clashes with a live listing (all/tag/category)
+    return f'{LISTING_PREFIX}staging:{key}'
+
+def publish_listings(redis_client, tools, ttl=3600, chunk_size=1000):
+    """Write every listing and its counts; returns the number of listings
+
+    Each list and the meta hash are built under staging keys and RENAMEd
+    into place in one MULTI/EXEC, so readers never see an empty or partly
+    written listing, or a listing without its counts.
+    """
+    listings = build_listings(tools)
+    featured_ids = {str(tool['_id']) for tool in tools if tool.get('isFeatured')}
+
+    pipe = redis_client.pipeline(transaction=False)
+    meta = {}
+    for key, ids in listings.items():
+        staging = _staging_key(key)
+        pipe.delete(staging)
+        for start in range(0, len(ids), chunk_size):
+            pipe.rpush(staging, *ids[start:start + chunk_size])
+        if ids:
+            pipe.expire(staging, ttl)
+        featured = 0
+        while featured < len(ids) and ids[featured] in featured_ids:
+            featured += 1
+        meta[key] = json.dumps({'total': len(ids), 'featured': featured})
+    meta_staging = _staging_key(LISTING_META_KEY)
+    pipe.delete(meta_staging)
+    pipe.hset(meta_staging, mapping=meta)
+    pipe.expire(meta_staging, ttl)
+    pipe.execute()
+
+    swap = redis_client.pipeline(transaction=True)
+    for key, ids in listings.items():
+        if ids:
+            swap.rename(_staging_key(key), key)
+        else:
+            swap.delete(key)
+    swap.rename(meta_staging, LISTING_META_KEY)
+    swap.execute()
+    return len(listings)
+
+def get_listing_page(redis_client, kind, value=None, page=1, limit=20, featured_only=False):
+    """Return (total, ids) for one page of a cached listing, or None on a miss
+
+    Served with one pipelined round trip; total is the full listing size
+    (or featured count) so pagination is accurate.
+    """
+    key = listing_key(kind, value)
+    start = (page - 1) * limit
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hget(LISTING_META_KEY, key)
+    pipe.lrange(key, start, start + limit - 1)
+    meta, ids = pipe.execute()
+    if meta is None:
+        return None
+    meta = json.loads(meta)
+    if featured_only:
+        total = meta['featured']
+        ids = ids[:max(0, total - start)]
+    else:
+        total = meta['total']
+    return total, ids
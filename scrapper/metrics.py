@@ -0,0 +1,196 @@
+# metrics.py
+import os
+import sys
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Latency bucket upper bounds in seconds (Prometheus-style, cumulative on export)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, sum, min and max"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': self.min,
+            'max': self.max,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+def job_path(path, job):
+    """path with the job name filled in for {job}, or added before the extension
+
+    METRICS_JSON=metrics.json becomes metrics.refresh_redis_cache.json, so
+    jobs run in one process (the pipeline and the refresh it calls, say)
+    never overwrite each other's dumps.
+    """
+    if '{job}' in path:
+        return path.replace('{job}', job)
+    root, ext = os.path.splitext(path)
+    return f'{root}.{job}{ext}'
+
+class Metrics:
+    """Counters, latency histograms and rate-limited progress for one job run
+
+    Set METRICS_JSON to a file path to dump a JSON summary at the end of the
+    run, METRICS_TEXTFILE to write a Prometheus textfile (node_exporter
+    textfile collector format), and PROGRESS_INTERVAL to change how often
+    progress lines are printed (seconds, default 5). Each job writes its
+    own file (see job_path). With dump=False nothing is written, for
+    stand-in instances when a caller passes none. Safe to share between
+    threads.
+    """
+
+    def __init__(self, job, progress_interval=None, stream=None, dump=True):
+        self.job = job
+        self.dump_enabled = dump
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        if progress_interval is None:
+            progress_interval = float(os.getenv('PROGRESS_INTERVAL', '5'))
+        self.progress_interval = progress_interval
+        self.stream = stream or sys.stdout
+        self._last_progress = 0.0
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Record the wall-clock time of the block in histogram name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def progress(self, label, done, total=None, force=False):
+        """Print a progress line, at most once per progress_interval"""
+        now = time.perf_counter()
+        with self._lock:
+            if not force and now - self._last_progress < self.progress_interval:
+                return
+            self._last_progress = now
+        elapsed = now - self._start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        of_total = f"/{total}" if total is not None else ""
+        self.stream.write(f"   📝 {label}: {done}{of_total} ({rate:.1f}/s)\n")
+        self.stream.flush()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def summary(self):
+        with self._lock:
+            return {
+                'job': self.job,
+                'startedAt': self.started_at,
+                'durationSeconds': round(self.elapsed, 6),
+                'counters': dict(self.counters),
+                'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def to_prometheus(self, prefix='seohub_scrapper'):
+        """Render counters and histograms in the Prometheus text format"""
+        job = self.job
+        lines = [
+            f'# TYPE {prefix}_duration_seconds gauge',
+            f'{prefix}_duration_seconds{{job="{job}"}} {self.elapsed:.6f}',
+            f'# TYPE {prefix}_last_run_timestamp_seconds gauge',
+            f'{prefix}_last_run_timestamp_seconds{{job="{job}"}} {self.started_at:.3f}',
+        ]
+        for name, value in sorted(self.counters.items()):
+            metric = f'{prefix}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{{job="{job}"}} {value}')
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f'{prefix}_{name}_seconds'
+            lines.append(f'# TYPE {metric} histogram')
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{job="{job}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{job="{job}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{job="{job}"}} {histogram.sum:.6f}')
+            lines.append(f'{metric}_count{{job="{job}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def report(self):
+        """Print a compact latency summary and write any configured dumps"""
+        for name, histogram in sorted(self.histograms.items()):
+            if histogram.count:
+                stats = histogram.to_dict()
+                print(f"   ⏱️  {name}: n={stats['count']} mean={stats['mean'] * 1000:.1f}ms "
+                      f"p95≤{stats['p95'] * 1000:.1f}ms max={stats['max'] * 1000:.1f}ms")
+        self.dump()
+
+    def dump(self, json_path=None, textfile_path=None):
+        """Write the JSON summary and/or Prometheus textfile if configured"""
+        if not self.dump_enabled:
+            return
+        json_path = json_path or os.getenv('METRICS_JSON')
+        textfile_path = textfile_path or os.getenv('METRICS_TEXTFILE')
+        if json_path:
+            json_path = job_path(json_path, self.job)
+        if textfile_path:
+            textfile_path = job_path(textfile_path, self.job)
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, indent=2)
+            print(f"   📄 Metrics written to {json_path}")
+        if textfile_path:
+            # Write then rename so the collector never reads a partial file
+            tmp_path = f"{textfile_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, textfile_path)
+            print(f"   📄 Prometheus metrics written to {textfile_path}")
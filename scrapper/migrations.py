@@ -0,0 +1,113 @@
+# migrations.py
+import time
+from datetime import datetime, timezone
+from metrics import Metrics
+
+MIGRATIONS_COLLECTION = 'migrations'
+RUNNING, DONE = 'running', 'done'
+
+class Throttle:
+    """Sleeps between batches so writes stay under max_ops_per_sec"""
+
+    def __init__(self, max_ops_per_sec=None):
+        self.max_ops_per_sec = max_ops_per_sec
+        self.started = time.monotonic()
+        self.ops = 0
+
+    def wait(self, ops):
+        self.ops += ops
+        if not self.max_ops_per_sec:
+            return
+        ahead = self.ops / self.max_ops_per_sec - (time.monotonic() - self.started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+def _now():
+    return datetime.now(timezone.utc)
+
+def iter_id_chunks(collection, query, projection=None, chunk_size=1000, after_id=None):
+    """Yield lists of matching documents in _id order, one bounded query per chunk"""
+    while True:
+        chunk_query = dict(query)
+        if after_id is not None:
+            chunk_query['_id'] = {'$gt': after_id}
+        chunk = list(collection.find(chunk_query, projection).sort('_id', 1).limit(chunk_size))
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1]['_id']
+
+def run_migration(db, name, collection, query, build_update, projection=None,
+                  chunk_size=1000, max_ops_per_sec=None, dry_run=False, restart=False):
+    """Apply build_update(doc) to every document matching query, resumably
+
+    build_update returns an update document for UpdateOne, or None to leave
+    the document alone. Each chunk is written with one unordered bulk_write
+    and its last _id saved in the migrations collection, so an interrupted
+    run resumes where it stopped; a finished migration starts over. With
+    dry_run only the matching documents are counted. Returns a dict with
+    matched, scanned and modified counts.
+    """
+    from pymongo import UpdateOne
+
+    migrations = db[MIGRATIONS_COLLECTION]
+    matched = collection.count_documents(query)
+    if dry_run:
+        print(f"🧪 Dry run: {matched} documents would be migrated by '{name}'")
+        return {'matched': matched, 'scanned': 0, 'modified': 0}
+
+    state = migrations.find_one({'_id': name})
+    resuming = state is not None and state.get('status') == RUNNING and not restart
+    after_id = state.get('lastId') if resuming else None
+    scanned = state.get('scanned', 0) if resuming else 0
+    modified = state.get('modified', 0) if resuming else 0
+    if resuming:
+        print(f"⏯️  Resuming '{name}' after {after_id} ({scanned} already scanned)")
+    else:
+        migrations.replace_one({'_id': name}, {
+            'status': RUNNING, 'scanned': 0, 'modified': 0, 'lastId': None,
+            'startedAt': _now(), 'updatedAt': _now(),
+        }, upsert=True)
+
+    metrics = Metrics(f'migration_{name}')
+    throttle = Throttle(max_ops_per_sec)
+    try:
+        for chunk in iter_id_chunks(collection, query, projection, chunk_size, after_id):
+            operations = []
+            for doc in chunk:
+                update = build_update(doc)
+                if update is not None:
+                    operations.append(UpdateOne({'_id': doc['_id']}, update))
+            if operations:
+                with metrics.timer('bulk_write'):
+                    result = collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count
+                throttle.wait(len(operations))
+            scanned += len(chunk)
+            migrations.update_one({'_id': name}, {'$set': {
+                'lastId': chunk[-1]['_id'], 'scanned': scanned, 'modified': modified, 'updatedAt': _now(),
+            }})
+            metrics.progress('documents', scanned, matched)
+
+        migrations.update_one({'_id': name}, {'$set': {'status': DONE, 'finishedAt': _now(), 'updatedAt': _now()}})
+        metrics.incr('scanned', scanned)
+        metrics.incr('modified', modified)
+    finally:
+        metrics.report()
+    return {'matched': matched, 'scanned': scanned, 'modified': modified}
+
+def add_migration_arguments(parser):
+    """The --dry-run, --restart, --chunk-size and --max-ops-per-sec flags shared by fix_* scripts"""
+    parser.add_argument('--dry-run', action='store_true', help="only count the documents that would change")
+    parser.add_argument('--restart', action='store_true', help="ignore an unfinished checkpoint")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--max-ops-per-sec', type=float, default=None)
+    return parser
+
+def migration_options(args):
+    return {
+        'dry_run': args.dry_run,
+        'restart': args.restart,
+        'chunk_size': args.chunk_size,
+        'max_ops_per_sec': args.max_ops_per_sec,
+    }
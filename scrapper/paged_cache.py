@@ -0,0 +1,72 @@
+# paged_cache.py
+import json
+import cache_codec
+
+# Card projection used by list views; description, visual and the rest of
+# the document stay in tool:{id}
+CARD_FIELDS = ('_id', 'name', 'slug', 'tagline', 'logoUrl', 'averageRating', 'isFeatured')
+PAGE_SIZE = 24
+
+PAGES_INDEX_KEY = 'allTools:pages'
+PAGE_KEY_PREFIX = 'allTools:page:'
+
+def page_key(page):
+    return f'{PAGE_KEY_PREFIX}{page}'
+
+def to_card(tool):
+    return {field: tool.get(field) for field in CARD_FIELDS}
+
+def build_pages(tools, page_size=PAGE_SIZE):
+    """Split tools (in allTools order) into 1-based pages of card projections"""
+    return [
+        [to_card(tool) for tool in tools[start:start + page_size]]
+        for start in range(0, len(tools), page_size)
+    ]
+
+def publish_pages(redis_client, tools, page_size=PAGE_SIZE, ttl=3600, codec=None):
+    """Write allTools:page:{n} for every page plus the allTools:pages index
+
+    Pages left over from a previous, larger catalog are deleted. Returns
+    the total number of bytes written for the pages.
+    """
+    pages = build_pages(tools, page_size)
+    previous = cache_codec.loads(redis_client.get(PAGES_INDEX_KEY))
+    previous_pages = previous['totalPages'] if previous else 0
+
+    index = {
+        'pageSize': page_size,
+        'totalPages': len(pages),
+        'totalTools': len(tools),
+        'featuredTools': sum(1 for tool in tools if tool.get('isFeatured')),
+        'fields': list(CARD_FIELDS),
+    }
+
+    pipe = redis_client.pipeline(transaction=False)
+    written = 0
+    for number, cards in enumerate(pages, 1):
+        payload = json.dumps(cards, separators=(',', ':'), ensure_ascii=False)
+        if codec is not None:
+            payload = codec.encode(payload)
+        written += cache_codec.stored_size(payload)
+        pipe.setex(page_key(number), ttl, payload)
+    for number in range(len(pages) + 1, previous_pages + 1):
+        pipe.delete(page_key(number))
+    pipe.setex(PAGES_INDEX_KEY, ttl, json.dumps(index))
+    pipe.execute()
+    return written
+
+def get_page(redis_client, page):
+    """Return (index, cards) for a 1-based page in one round trip, or None on a miss
+
+    Use a bytes client (decode_responses=False) if pages may be compressed.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.get(PAGES_INDEX_KEY)
+    pipe.get(page_key(page))
+    index, cards = pipe.execute()
+    if index is None:
+        return None
+    index = cache_codec.loads(index)
+    if cards is None:
+        return (index, []) if page > index['totalPages'] else None
+    return index, cache_codec.loads(cards)
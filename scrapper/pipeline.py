@@ -0,0 +1,290 @@
+# pipeline.py
+import argparse
+import queue
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from profiling import add_profile_arguments, profiled
+
+# Marks the end of a stage's output stream
+_DONE = object()
+
+class PipelineStage(threading.Thread):
+    """A pipeline stage running in its own thread
+
+    Source stages (no inbox) call fn() and stream the returned iterable.
+    Other stages call fn(batch) on up to batch_size items at a time and
+    stream whatever it returns. Every output item is put on each outbox;
+    outboxes are bounded queues, so a slow consumer applies backpressure.
+    """
+
+    def __init__(self, name, fn, inbox=None, outboxes=(), batch_size=1):
+        super().__init__(name=name, daemon=True)
+        self.fn = fn
+        self.inbox = inbox
+        self.outboxes = list(outboxes)
+        self.batch_size = batch_size
+        self.items_in = 0
+        self.items_out = 0
+        self.busy = 0.0
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+
+    def _emit(self, results):
+        for item in results or ():
+            self.items_out += 1
+            for outbox in self.outboxes:
+                outbox.put(item)
+
+    def _call(self, *args):
+        start = time.perf_counter()
+        try:
+            return list(self.fn(*args) or ())
+        finally:
+            self.busy += time.perf_counter() - start
+
+    def _run_source(self):
+        results = iter(self._call_source())
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(results)
+            except StopIteration:
+                return
+            finally:
+                self.busy += time.perf_counter() - start
+            self._emit([item])
+
+    def _call_source(self):
+        start = time.perf_counter()
+        try:
+            return self.fn() or ()
+        finally:
+            self.busy += time.perf_counter() - start
+
+    def _run_batches(self):
+        batch = []
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                break
+            self.items_in += 1
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._emit(self._call(batch))
+                batch = []
+        if batch:
+            self._emit(self._call(batch))
+
+    def _drain(self):
+        # Keep consuming after a failure so upstream stages never block
+        if self.inbox is None:
+            return
+        while self.inbox.get() is not _DONE:
+            pass
+
+    def run(self):
+        self.started_at = time.perf_counter()
+        try:
+            if self.inbox is None:
+                self._run_source()
+            else:
+                self._run_batches()
+        except Exception as e:
+            self.error = e
+            print(f"❌ Stage '{self.name}' failed: {e}")
+            traceback.print_exc()
+            self._drain()
+        finally:
+            for outbox in self.outboxes:
+                outbox.put(_DONE)
+            self.finished_at = time.perf_counter()
+
+    @property
+    def wall(self):
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+class StepTimer:
+    """Timing record for a blocking step run after the streaming stages"""
+
+    def __init__(self, name):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.busy = 0.0
+        self.wall = 0.0
+        self.error = None
+
+    def run(self, fn):
+        start = time.perf_counter()
+        try:
+            return fn()
+        except Exception as e:
+            self.error = e
+            print(f"❌ Step '{self.name}' failed: {e}")
+            traceback.print_exc()
+        finally:
+            self.busy = self.wall = time.perf_counter() - start
+
+def run_pipeline(target_count=60, queue_size=100, upload_batch_size=100,
+                 logo_dir='tool_logos', logo_delay=0.5, with_logos=True, with_cache=True):
+    """Scrape, clean, upload, fetch logos and refresh the cache in one process
+
+    Stages exchange tools through bounded in-memory queues instead of the
+    intermediate text files. Only tools the upload stage actually inserted
+    go on to the logo stages, keyed by their _id and stored slug, so
+    duplicates never overwrite an existing logoUrl. Logo URLs are written
+    once every stage has finished, then the Redis cache is rebuilt.
+    """
+    from scrapper import MultiSourceAIToolScraper
+    from tool_schema import transform_batch
+    from upload_to_mongo import load_existing_names, upload_tool_batch
+    from connections import get_db
+
+    from metrics import Metrics
+
+    print("🚀 Starting in-process pipeline...")
+    metrics = Metrics('pipeline')
+    pipeline_start = time.perf_counter()
+
+    tools_collection = get_db().tools
+    existing_names = load_existing_names(tools_collection)
+    reserved_slugs = set()
+
+    scraped_q = queue.Queue(maxsize=queue_size)
+    upload_q = queue.Queue(maxsize=queue_size)
+    logo_q = queue.Queue(maxsize=queue_size)
+    downloaded_q = queue.Queue(maxsize=queue_size)
+
+    uploaded = []
+    rejected = []
+    logo_updates = []
+
+    def scrape():
+        return MultiSourceAIToolScraper().run_comprehensive_scraper(target_count=target_count)
+
+    def clean(batch):
+        valid, invalid = transform_batch(batch)
+        rejected.extend(invalid)
+        return valid
+
+    def upload(batch):
+        # The inserted documents carry their _id and assigned slug on to the logo stages
+        inserted = upload_tool_batch(batch, tools_collection, existing_names, reserved_slugs)
+        uploaded.extend(inserted)
+        return inserted
+
+    stages = [
+        PipelineStage('scrape', scrape, outboxes=[scraped_q]),
+        PipelineStage('clean', clean, inbox=scraped_q, outboxes=[upload_q], batch_size=50),
+        PipelineStage('upload', upload, inbox=upload_q, outboxes=[logo_q] if with_logos else [],
+                      batch_size=upload_batch_size),
+    ]
+
+    if with_logos:
+        from download_tool_logos import download_tool_logo
+        from upload_logo import upload_logo_file
+        from pymongo import UpdateOne
+
+        Path(logo_dir).mkdir(exist_ok=True)
+
+        def download(batch):
+            results = []
+            for tool in batch:
+                result = download_tool_logo(tool, logo_dir, metrics=metrics, slug=tool['slug'])
+                if result['status'] == 'downloaded':
+                    result['tool_id'] = tool['_id']
+                    results.append(result)
+                if result['status'] != 'no_website_url':
+                    time.sleep(logo_delay)
+            return results
+
+        def upload_logos(batch):
+            for result in batch:
+                try:
+                    with metrics.timer('logo_upload'):
+                        url = upload_logo_file(result['file_path'], result['slug'])
+                except Exception as e:
+                    metrics.incr('logo_upload_errors')
+                    print(f"❌ Failed to upload {result['name']}: {e}")
+                    continue
+                logo_updates.append(UpdateOne(
+                    {'_id': result['tool_id']},
+                    {'$set': {'logoUrl': url, 'updatedAt': datetime.utcnow()}}
+                ))
+
+        stages += [
+            PipelineStage('logo_download', download, inbox=logo_q, outboxes=[downloaded_q]),
+            PipelineStage('logo_upload', upload_logos, inbox=downloaded_q),
+        ]
+
+    for stage in stages:
+        stage.start()
+    for stage in stages:
+        stage.join()
+
+    steps = []
+    if with_logos:
+        step = StepTimer('logo_update')
+        step.items_in = len(logo_updates)
+        if logo_updates:
+            result = step.run(lambda: tools_collection.bulk_write(logo_updates, ordered=False))
+            step.items_out = result.modified_count if result else 0
+        steps.append(step)
+
+    if with_cache:
+        from refresh_redis_cache import refresh_with_lock
+        step = StepTimer('cache_refresh')
+        step.run(refresh_with_lock)
+        steps.append(step)
+
+    print_stage_report(stages + steps, time.perf_counter() - pipeline_start)
+    print(f"   📤 New tools uploaded: {len(uploaded)}")
+    for stage in stages + steps:
+        metrics.observe(f'stage_{stage.name}', stage.wall)
+    if rejected:
+        from clean_data import write_rejects, REJECT_FILE
+        write_rejects(rejected)
+        print(f"   ⚠️  Rejected {len(rejected)} rows, see {REJECT_FILE}")
+    metrics.report()
+    return uploaded
+
+def print_stage_report(stages, total):
+    """Print per-stage item counts and timings"""
+    print("\n" + "=" * 60)
+    print("📊 PIPELINE STAGE TIMINGS")
+    print("=" * 60)
+    print(f"   {'stage':<15}{'in':>7}{'out':>7}{'busy s':>10}{'wall s':>10}  status")
+    for stage in stages:
+        status = f"failed: {stage.error}" if stage.error else "ok"
+        print(f"   {stage.name:<15}{stage.items_in:>7}{stage.items_out:>7}"
+              f"{stage.busy:>10.2f}{stage.wall:>10.2f}  {status}")
+    print(f"   ⏱️  Total: {total:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run scrape → clean → upload → logos → cache in one process")
+    parser.add_argument('--target-count', type=int, default=60)
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--upload-batch-size', type=int, default=100)
+    parser.add_argument('--logo-dir', default='tool_logos')
+    parser.add_argument('--logo-delay', type=float, default=0.5)
+    parser.add_argument('--skip-logos', action='store_true')
+    parser.add_argument('--skip-cache', action='store_true')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiled('pipeline', args.profile, args.profile_dir):
+        run_pipeline(
+            target_count=args.target_count,
+            queue_size=args.queue_size,
+            upload_batch_size=args.upload_batch_size,
+            logo_dir=args.logo_dir,
+            logo_delay=args.logo_delay,
+            with_logos=not args.skip_logos,
+            with_cache=not args.skip_cache,
+        )
@@ -0,0 +1,175 @@
+# profiling.py
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# SCRAPPER_PROFILE=cprofile,sample,tracemalloc,phases (or "all") turns them
+# on for one run; --profile does the same for scripts that take arguments.
+PROFILE_MODES = ('cprofile', 'sample', 'tracemalloc', 'phases')
+# Next to this file whatever the working directory, so .gitignore covers it
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+TOP_ENTRIES = 15
+
+_NOOP = nullcontext()
+# Set while a profiled() block records phases (the phases or tracemalloc modes)
+_recording = False
+# phase() runs in the pipeline's worker threads too
+_phases_lock = threading.Lock()
+_phases = {}
+# Phases running right now -> whether another phase overlapped them
+_active = {}
+
+def parse_modes(value):
+    """Turn 'all', '1' or a comma-separated list into a set of modes"""
+    if not value:
+        return frozenset()
+    names = {name.strip().lower() for name in value.split(',') if name.strip()}
+    if names & {'1', 'true', 'all'}:
+        return frozenset(PROFILE_MODES)
+    unknown = names - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"unknown profile modes {', '.join(sorted(unknown))}; use {', '.join(PROFILE_MODES)} or all")
+    return frozenset(names)
+
+def add_profile_arguments(parser):
+    """Add --profile and --profile-dir to an argparse parser"""
+    parser.add_argument('--profile', nargs='?', const='all', default=None,
+                        help=f"profile this run: all or any of {', '.join(PROFILE_MODES)} (env SCRAPPER_PROFILE)")
+    parser.add_argument('--profile-dir', default=None,
+                        help=f"where profile dumps go (env SCRAPPER_PROFILE_DIR, default {DEFAULT_PROFILE_DIR})")
+    return parser
+
+def phase(name):
+    """Time a top-level phase of a job (connect, fetch, transform, write)
+
+    Returns a shared no-op context manager unless a profiled() block with
+    the phases or tracemalloc mode is running, so calls can stay in the
+    code permanently. Safe to call from several threads. With tracemalloc
+    the peak traced memory inside the phase is kept too, but only for runs
+    no other phase overlapped, since the traced peak is process-wide.
+    """
+    if not _recording:
+        return _NOOP
+    return _timed_phase(name)
+
+@contextmanager
+def _timed_phase(name):
+    import tracemalloc
+
+    token = object()
+    with _phases_lock:
+        alone = not _active
+        for other in _active:
+            _active[other] = True
+        _active[token] = not alone
+        tracing = tracemalloc.is_tracing()
+        if tracing and alone:
+            tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        with _phases_lock:
+            overlapped = _active.pop(token)
+            entry = _phases.setdefault(name, {'count': 0, 'seconds': 0.0})
+            entry['count'] += 1
+            entry['seconds'] += seconds
+            if tracing and not overlapped:
+                entry['peak_bytes'] = max(entry.get('peak_bytes', 0), tracemalloc.get_traced_memory()[1])
+
+def _start_sampler():
+    import importlib.util
+
+    if importlib.util.find_spec('pyinstrument') is None:
+        print("⚠️  Sampling profiler requested but pyinstrument is not installed; skipping")
+        return None
+    from pyinstrument import Profiler
+
+    sampler = Profiler(interval=float(os.getenv('SCRAPPER_PROFILE_INTERVAL', '0.001')))
+    sampler.start()
+    return sampler
+
+def _report_phases(path):
+    print("   ⏱️  Phases:")
+    for name, entry in _phases.items():
+        peak = f"  peak {entry['peak_bytes'] / 1e6:.1f} MB" if 'peak_bytes' in entry else ''
+        print(f"      {name:<12} {entry['seconds']:>9.3f}s  x{entry['count']}{peak}")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(_phases, f, indent=2)
+
+def _report_tracemalloc(path):
+    """Stop tracing, dump a snapshot and print where the memory still held was allocated"""
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    snapshot.dump(path)
+    print(f"   🧠 Traced memory: {current / 1e6:.1f} MB live at exit, {peak / 1e6:.1f} MB peak ({path})")
+    for stat in snapshot.statistics('lineno')[:TOP_ENTRIES]:
+        frame = stat.traceback[0]
+        print(f"      {stat.size / 1e6:>8.2f} MB  {stat.count:>8} blocks  {frame.filename}:{frame.lineno}")
+
+@contextmanager
+def profiled(job, modes=None, out_dir=None):
+    """Profile the block according to modes (default: env SCRAPPER_PROFILE)
+
+    cprofile writes a .pstats dump and prints the top functions by
+    cumulative time; sample writes a pyinstrument report if pyinstrument
+    is installed; tracemalloc writes a snapshot, prints where live memory
+    was allocated and adds per-phase peaks; phases prints and writes the
+    phase() timers. cProfile and pyinstrument only see the thread that
+    entered the block. Without any mode this does nothing at all.
+    """
+    global _recording
+
+    modes = parse_modes(modes if modes is not None else os.getenv('SCRAPPER_PROFILE'))
+    if not modes:
+        yield
+        return
+
+    out_dir = out_dir or os.getenv('SCRAPPER_PROFILE_DIR', DEFAULT_PROFILE_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{job}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    print(f"🔬 Profiling {job} ({', '.join(sorted(modes))}) into {out_dir}/")
+
+    if 'tracemalloc' in modes:
+        import tracemalloc
+        tracemalloc.start(int(os.getenv('SCRAPPER_TRACEMALLOC_FRAMES', '1')))
+    sampler = _start_sampler() if 'sample' in modes else None
+    profiler = None
+    if 'cprofile' in modes:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    with _phases_lock:
+        _phases.clear()
+        _active.clear()
+    _recording = bool(modes & {'phases', 'tracemalloc'})
+
+    try:
+        yield
+    finally:
+        _recording = False
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        # Before the reports below, so their own allocations are not traced
+        if 'tracemalloc' in modes:
+            _report_tracemalloc(f'{base}.tracemalloc')
+        if _phases:
+            _report_phases(f'{base}.phases.json')
+        if profiler is not None:
+            import pstats
+            profiler.dump_stats(f'{base}.pstats')
+            print(f"\n   📈 Top {TOP_ENTRIES} functions by cumulative time ({base}.pstats):")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(TOP_ENTRIES)
+        if sampler is not None:
+            with open(f'{base}.sample.txt', 'w', encoding='utf-8') as f:
+                f.write(sampler.output_text())
+            print(f"   📄 Sampling profile written to {base}.sample.txt")
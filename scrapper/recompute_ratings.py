@@ -0,0 +1,93 @@
+# recompute_ratings.py
+import argparse
+import traceback
+from connections import get_db
+from metrics import Metrics
+from profiling import add_profile_arguments, profiled
+
+# averageRating is stored unrounded, as in rateTool (controllers/toolController.js)
+FLOAT_TOLERANCE = 1e-9
+ZERO_RATINGS = {'totalRatingSum': 0, 'numberOfRatings': 0, 'averageRating': 0}
+
+RATING_TOTALS_PIPELINE = [
+    {'$group': {
+        '_id': '$tool',
+        'totalRatingSum': {'$sum': '$rating'},
+        'numberOfRatings': {'$sum': 1},
+    }},
+]
+
+def expected_ratings(rating_rows):
+    """Map tool id -> the three rating fields implied by the ratings collection"""
+    expected = {}
+    for row in rating_rows:
+        count = row['numberOfRatings']
+        expected[row['_id']] = {
+            'totalRatingSum': row['totalRatingSum'],
+            'numberOfRatings': count,
+            'averageRating': row['totalRatingSum'] / count if count else 0,
+        }
+    return expected
+
+def _drifted(current, wanted):
+    for field, value in wanted.items():
+        stored = current.get(field)
+        if not isinstance(stored, (int, float)) or abs(stored - value) > FLOAT_TOLERANCE:
+            return True
+    return False
+
+def rating_operations(tools, expected):
+    """UpdateOne for every tool whose stored rating fields differ from expected
+
+    Tools with no ratings at all are expected to hold zeros.
+    """
+    from pymongo import UpdateOne
+
+    operations = []
+    for tool in tools:
+        wanted = expected.get(tool['_id'], ZERO_RATINGS)
+        if _drifted(tool, wanted):
+            operations.append(UpdateOne({'_id': tool['_id']}, {'$set': wanted}))
+    return operations
+
+def recompute_ratings(dry_run=False):
+    """Recompute rating fields for all tools from ratings, writing only drifted tools"""
+
+    metrics = Metrics('recompute_ratings')
+
+    try:
+        db = get_db()
+
+        with metrics.timer('ratings_aggregate'):
+            expected = expected_ratings(db.ratings.aggregate(RATING_TOTALS_PIPELINE, allowDiskUse=True))
+        print(f"⭐ Ratings found for {len(expected)} tools")
+
+        with metrics.timer('tools_fetch'):
+            tools = db.tools.find({}, {'totalRatingSum': 1, 'numberOfRatings': 1, 'averageRating': 1})
+            operations = rating_operations(tools, expected)
+        metrics.incr('tools_drifted', len(operations))
+        print(f"📊 {len(operations)} tools have drifted rating fields")
+
+        if not operations:
+            print("✅ All tool ratings match the ratings collection!")
+            return
+        if dry_run:
+            print("🧪 Dry run: nothing written")
+            return
+
+        with metrics.timer('bulk_write'):
+            result = db.tools.bulk_write(operations, ordered=False)
+        print(f"✅ Fixed ratings on {result.modified_count} tools")
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Recompute tool rating fields from the ratings collection"))
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    with profiled('recompute_ratings', args.profile, args.profile_dir):
+        recompute_ratings(dry_run=args.dry_run)
@@ -0,0 +1,118 @@
+# redis_lock.py
+import os
+import socket
+import threading
+
+# Compare-and-delete / compare-and-extend, so a holder whose lock already
+# expired can never release or extend someone else's
+_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_EXTEND = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+# Write KEYS[2] only if ARGV[1] is not older than the newest token seen
+# in KEYS[1]; a refresher that lost its lock mid-run cannot overwrite the
+# result of the one that took over
+_FENCED_SETEX = """
+local newest = tonumber(redis.call('GET', KEYS[1]) or '0')
+local token = tonumber(ARGV[1])
+if token < newest then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1])
+redis.call('SETEX', KEYS[2], ARGV[2], ARGV[3])
+return 1
+"""
+
+class LockLost(Exception):
+    """The lock expired or passed to another holder while work was running"""
+
+class RedisLock:
+    """Single-holder lock taken with SET NX PX, carrying a fencing token
+
+    Every successful acquire takes a new, strictly increasing token from
+    INCR {name}:fence. A holder calls ensure_held before each write step
+    and stops once the heartbeat fails to renew the lock; the final write
+    goes through fenced_setex with the token, so a holder that stalled
+    past both checks still cannot publish over a newer one.
+    """
+
+    def __init__(self, redis_client, name, ttl_ms=15 * 60 * 1000):
+        self.redis = redis_client
+        self.key = f'lock:{name}'
+        self.fence_key = f'lock:{name}:fence'
+        self.committed_key = f'lock:{name}:committed'
+        self.ttl_ms = ttl_ms
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self.token = None
+        self._value = None
+        self._heartbeat = None
+        self._stop = threading.Event()
+        # Set by the heartbeat once a renewal fails; the lock is gone from then on
+        self.lost = threading.Event()
+
+    def acquire(self):
+        """Try once to take the lock; returns the fencing token or None"""
+        token = self.redis.incr(self.fence_key)
+        value = f'{token}:{self.owner}'
+        if not self.redis.set(self.key, value, nx=True, px=self.ttl_ms):
+            return None
+        self.token, self._value = token, value
+        self._stop.clear()
+        self.lost.clear()
+        self._heartbeat = threading.Thread(target=self._keep_alive, name='lock-heartbeat', daemon=True)
+        self._heartbeat.start()
+        return token
+
+    def _keep_alive(self):
+        while not self._stop.wait(self.ttl_ms / 3000):
+            try:
+                renewed = self.extend()
+            except Exception as e:
+                print(f"⚠️  Could not renew lock {self.key}: {e}")
+                renewed = False
+            if not renewed:
+                self.lost.set()
+                print(f"⚠️  Lost lock {self.key} (token {self.token})")
+                return
+
+    def extend(self):
+        return bool(self.redis.eval(_EXTEND, 1, self.key, self._value, self.ttl_ms))
+
+    def held(self):
+        return self._value is not None and self.redis.get(self.key) == self._value
+
+    def ensure_held(self):
+        """Raise LockLost unless the lock is still ours and no newer token has written"""
+        if not self.lost.is_set() and self._value is not None:
+            current, committed = self.redis.mget(self.key, self.committed_key)
+            if current == self._value and int(committed or 0) <= self.token:
+                return
+        self.lost.set()
+        raise LockLost(f"lock {self.key} lost (token {self.token})")
+
+    def release(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        if self._value is not None:
+            self.redis.eval(_RELEASE, 1, self.key, self._value)
+        self.token = self._value = None
+
+    def fenced_setex(self, key, ttl, value):
+        """SETEX key unless a newer token has already written; returns True if written"""
+        return bool(self.redis.eval(_FENCED_SETEX, 2, self.committed_key, key, self.token, ttl, value))
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
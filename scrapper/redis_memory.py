@@ -0,0 +1,203 @@
+# redis_memory.py
+import json
+import random
+import argparse
+import traceback
+from cache_codec import CODEC_GZIP, CacheCodec
+from connections import REDIS_URL, get_redis_client
+from metrics import Metrics
+from profiling import add_profile_arguments, profiled
+
+SAMPLES_PER_FAMILY = 200
+MODEL_PREFIX = 'memmodel:'
+
+# Checked in order; the first matching prefix names the family
+KEY_FAMILIES = [
+    ('allTools:page:', 'allTools pages'),
+    ('tool:slug:', 'tool:slug:*'),
+    ('tool:', 'tool:*'),
+    ('listing:', 'listing:*'),
+    ('search:', 'search:*'),
+    ('searchidx:', 'searchidx:*'),
+    ('hll:', 'hll:*'),
+    ('lock:', 'lock:*'),
+]
+SINGLE_KEYS = {
+    'allTools', 'featuredTools', 'allTools:pages', 'cache:meta', 'trending', 'refresh:health',
+    'tool:slugs', 'tool:slugs:staging',
+}
+
+def key_family(key):
+    if key in SINGLE_KEYS:
+        return key
+    for prefix, family in KEY_FAMILIES:
+        if key.startswith(prefix):
+            return family
+    return 'other'
+
+def _text(key):
+    return key.decode('utf-8', 'replace') if isinstance(key, bytes) else key
+
+def scan_families(redis_client):
+    """Map family -> list of keys from one SCAN over the keyspace"""
+    families = {}
+    for key in redis_client.scan_iter(count=1000):
+        key = _text(key)
+        families.setdefault(key_family(key), []).append(key)
+    return families
+
+def measure_families(redis_client, families, samples=SAMPLES_PER_FAMILY, rng=random):
+    """Estimate bytes per family from MEMORY USAGE on a sample of each family's keys"""
+    report = {}
+    for family, keys in families.items():
+        sampled = keys if len(keys) <= samples else rng.sample(keys, samples)
+        pipe = redis_client.pipeline(transaction=False)
+        for key in sampled:
+            pipe.memory_usage(key, samples=0)
+        sizes = [size for size in pipe.execute() if size is not None]
+        mean = sum(sizes) / len(sizes) if sizes else 0
+        report[family] = {'keys': len(keys), 'sampled': len(sizes), 'mean_bytes': mean, 'bytes': mean * len(keys)}
+    return report
+
+def largest_tools(redis_client, keys, top=10, batch_size=1000):
+    """The biggest tool:{id} values by STRLEN; keys that are not strings are skipped"""
+    sizes = []
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start:start + batch_size]
+        pipe = redis_client.pipeline(transaction=False)
+        for key in chunk:
+            pipe.strlen(key)
+        sizes.extend(
+            (size, key) for size, key in zip(pipe.execute(raise_on_error=False), chunk)
+            if not isinstance(size, Exception)
+        )
+    return sorted(sizes, reverse=True)[:top]
+
+def print_family_report(report):
+    total = sum(entry['bytes'] for entry in report.values()) or 1
+    print(f"\n{'family':<18} {'keys':>9} {'avg bytes':>10} {'est. MB':>9} {'share':>6}")
+    for family, entry in sorted(report.items(), key=lambda item: -item[1]['bytes']):
+        print(f"{family:<18} {entry['keys']:>9} {entry['mean_bytes']:>10.0f} "
+              f"{entry['bytes'] / 1e6:>9.2f} {entry['bytes'] / total:>6.1%}")
+    slug = report.get('tool:slug:*')
+    if slug:
+        print(f"\n♻️  Slug keys duplicate tool JSON: ~{slug['bytes'] / 1e6:.2f} MB "
+              f"({slug['bytes'] / total:.1%} of the scanned keyspace)")
+
+def _layout_writers(codec):
+    """Each layout writes one tool (id, slug, JSON text) under MODEL_PREFIX"""
+    def current(pipe, tool_id, slug, text):
+        pipe.set(f'{MODEL_PREFIX}tool:{tool_id}', text)
+        pipe.set(f'{MODEL_PREFIX}tool:slug:{slug}', text)
+
+    def slug_keys(pipe, tool_id, slug, text):
+        pipe.set(f'{MODEL_PREFIX}tool:{tool_id}', text)
+        pipe.set(f'{MODEL_PREFIX}tool:slug:{slug}', tool_id)
+
+    def slug_hash(pipe, tool_id, slug, text):
+        pipe.set(f'{MODEL_PREFIX}tool:{tool_id}', text)
+        pipe.hset(f'{MODEL_PREFIX}tool:slugs', slug, tool_id)
+
+    def field_hash(pipe, tool_id, slug, text):
+        doc = json.loads(text)
+        pipe.hset(f'{MODEL_PREFIX}tool:{tool_id}', mapping={
+            field: json.dumps(value, ensure_ascii=False) for field, value in doc.items()
+        })
+        pipe.hset(f'{MODEL_PREFIX}tool:slugs', slug, tool_id)
+
+    def compressed(pipe, tool_id, slug, text):
+        pipe.set(f'{MODEL_PREFIX}tool:{tool_id}', codec.encode(text))
+        pipe.hset(f'{MODEL_PREFIX}tool:slugs', slug, tool_id)
+
+    return [
+        ('id + slug copies (current)', current),
+        ('id + slug→id keys', slug_keys),
+        ('id + tool:slugs hash', slug_hash),
+        ('field hash + tool:slugs', field_hash),
+        ('gzip id + tool:slugs', compressed),
+    ]
+
+def model_layouts(model_client, tools, total_tools):
+    """Write the sample in each layout to a scratch Redis and extrapolate to total_tools"""
+    codec = CacheCodec(CODEC_GZIP, min_bytes=0)
+    leftovers = list(model_client.scan_iter(match=f'{MODEL_PREFIX}*', count=1000))
+    if leftovers:
+        model_client.delete(*leftovers)
+    results = []
+    for name, write in _layout_writers(codec):
+        pipe = model_client.pipeline(transaction=False)
+        for tool_id, slug, text in tools:
+            write(pipe, tool_id, slug, text)
+        pipe.execute()
+
+        keys = [_text(key) for key in model_client.scan_iter(match=f'{MODEL_PREFIX}*', count=1000)]
+        pipe = model_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key, samples=0)
+        used = sum(size or 0 for size in pipe.execute())
+        model_client.delete(*keys)
+        per_tool = used / len(tools)
+        results.append((name, per_tool, per_tool * total_tools, len(keys)))
+    return results
+
+def print_layout_report(results):
+    baseline = results[0][2] or 1
+    print(f"\n{'layout':<28} {'bytes/tool':>10} {'est. MB':>9} {'vs current':>10} {'keys':>6}")
+    for name, per_tool, total, keys in results:
+        print(f"{name:<28} {per_tool:>10.0f} {total / 1e6:>9.2f} {total / baseline:>10.0%} {keys:>6}")
+
+def analyze_memory(samples=SAMPLES_PER_FAMILY, model_url=None, model_tools=500):
+    """Report memory per key family and, with model_url, model alternative layouts"""
+
+    metrics = Metrics('analyze_memory')
+
+    try:
+        redis_client = get_redis_client(decode_responses=False)
+        print("🔍 Scanning keyspace...")
+        with metrics.timer('scan'):
+            families = scan_families(redis_client)
+        with metrics.timer('memory_usage'):
+            report = measure_families(redis_client, families, samples)
+        print_family_report(report)
+
+        tool_keys = families.get('tool:*', [])
+        if tool_keys:
+            with metrics.timer('strlen'):
+                top = largest_tools(redis_client, tool_keys)
+            print("\n🐘 Largest cached tools:")
+            for size, key in top:
+                print(f"   {size:>8} bytes  {key}")
+
+        if model_url:
+            if model_url == REDIS_URL:
+                print("❌ Refusing to model layouts on the production Redis; point --model-url at a local instance")
+                return
+            sampled = tool_keys if len(tool_keys) <= model_tools else random.sample(tool_keys, model_tools)
+            tools = []
+            for key, raw in zip(sampled, redis_client.mget(sampled) if sampled else []):
+                if raw is None or not raw.startswith(b'{'):
+                    continue
+                doc = json.loads(raw)
+                tools.append((key[len('tool:'):], doc.get('slug') or key, raw.decode('utf-8')))
+            if not tools:
+                print("⚠️  No plain JSON tool:* values to model with")
+                return
+            print(f"\n🧪 Modelling layouts with {len(tools)} tools on {model_url}...")
+            with metrics.timer('model'):
+                results = model_layouts(get_redis_client(model_url, decode_responses=False), tools, len(tool_keys))
+            print_layout_report(results)
+
+    except Exception as e:
+        print(f"❌ Error analyzing memory: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Report Redis memory per cache key family and model alternative layouts"))
+    parser.add_argument('--samples', type=int, default=SAMPLES_PER_FAMILY, help="MEMORY USAGE samples per family")
+    parser.add_argument('--model-url', help="scratch Redis (e.g. redis://localhost:6379/15) to model layouts on")
+    parser.add_argument('--model-tools', type=int, default=500)
+    args = parser.parse_args()
+    with profiled('analyze_memory', args.profile, args.profile_dir):
+        analyze_memory(samples=args.samples, model_url=args.model_url, model_tools=args.model_tools)
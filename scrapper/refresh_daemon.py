@@ -0,0 +1,165 @@
+# refresh_daemon.py
+import argparse
+import os
+import signal
+import threading
+import time
+from connections import get_redis_client
+from profiling import add_profile_arguments, profiled
+from redis_lock import RedisLock
+from refresh_redis_cache import REFRESH_LOCK_NAME, refresh_redis_cache
+
+LOCK_NAME = REFRESH_LOCK_NAME
+HEALTH_KEY = 'refresh:health'
+
+# Cache keys live for 3600 s; refresh well before they lapse
+CACHE_TTL = 3600
+DEFAULT_INTERVAL = 45 * 60
+# How soon to try again after a failed run or while another refresher holds the lock
+RETRY_DELAY = 60
+
+class RefreshHealth:
+    """Last-run bookkeeping, published to Redis and optionally a Prometheus textfile"""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.started_at = time.time()
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.consecutive_failures = 0
+        self.last_run_at = None
+        self.last_success_at = None
+        self.last_duration = None
+        self.last_status = 'never'
+        self.fencing_token = None
+        self.next_run_at = None
+
+    def record(self, ok, duration, token):
+        self.runs += 1
+        self.last_run_at = time.time()
+        self.last_duration = duration
+        self.fencing_token = token
+        if ok:
+            self.last_success_at = self.last_run_at
+            self.last_status = 'ok'
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_status = 'failed'
+
+    def to_dict(self):
+        return {
+            'owner': self.owner,
+            'startedAt': self.started_at,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'consecutiveFailures': self.consecutive_failures,
+            'lastRunAt': self.last_run_at or '',
+            'lastSuccessAt': self.last_success_at or '',
+            'lastDurationSeconds': self.last_duration if self.last_duration is not None else '',
+            'lastStatus': self.last_status,
+            'fencingToken': self.fencing_token or '',
+            'nextRunAt': self.next_run_at or '',
+        }
+
+    def to_prometheus(self, prefix='seohub_refresh_daemon'):
+        values = {
+            'runs_total': self.runs,
+            'failures_total': self.failures,
+            'skipped_total': self.skipped,
+            'consecutive_failures': self.consecutive_failures,
+            'last_success_timestamp_seconds': self.last_success_at or 0,
+            'last_duration_seconds': self.last_duration or 0,
+            'next_run_timestamp_seconds': self.next_run_at or 0,
+        }
+        lines = []
+        for name, value in values.items():
+            metric = f'{prefix}_{name}'
+            lines.append(f'# TYPE {metric} {"counter" if name.endswith("_total") else "gauge"}')
+            lines.append(f'{metric}{{owner="{self.owner}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def publish(self, redis_client, textfile_path=None):
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(HEALTH_KEY, mapping=self.to_dict())
+            pipe.expire(HEALTH_KEY, CACHE_TTL * 2)
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️  Could not publish refresh health: {e}")
+        if textfile_path:
+            tmp_path = f"{textfile_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, textfile_path)
+
+def run_once(lock, health):
+    """Refresh under the lock; returns True/False, or None if another refresher holds it"""
+    token = lock.acquire()
+    if token is None:
+        health.skipped += 1
+        print("⏭️  Another refresher holds the lock; skipping this run")
+        return None
+    print(f"🔒 Acquired refresh lock (fencing token {token})")
+    started = time.monotonic()
+    try:
+        ok = refresh_redis_cache(lock=lock, clear=False)
+    finally:
+        lock.release()
+    health.record(ok, time.monotonic() - started, token)
+    return ok
+
+def run_daemon(interval=DEFAULT_INTERVAL, lock_ttl=15 * 60, textfile_path=None):
+    """Refresh every `interval` seconds until SIGINT/SIGTERM
+
+    Only the holder of the Redis lock refreshes, so several daemons never
+    race; refresh_redis_cache.py and --once take the same lock, so a
+    manual run alongside a daemon is safe. Failed runs and runs skipped for
+    the lock are retried after RETRY_DELAY, backing off up to the interval.
+    """
+    if interval >= CACHE_TTL:
+        print(f"⚠️  Interval {interval}s is not shorter than the {CACHE_TTL}s cache TTL; caches will lapse")
+
+    redis_client = get_redis_client()
+    lock = RedisLock(redis_client, LOCK_NAME, ttl_ms=lock_ttl * 1000)
+    health = RefreshHealth(lock.owner)
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    print(f"🚀 Refresh daemon started as {lock.owner} (every {interval}s)")
+    while not stop.is_set():
+        ok = run_once(lock, health)
+        if ok:
+            delay = interval
+        elif ok is None:
+            delay = RETRY_DELAY
+        else:
+            delay = min(interval, RETRY_DELAY * 2 ** (health.consecutive_failures - 1))
+        health.next_run_at = time.time() + delay
+        health.publish(redis_client, textfile_path)
+        print(f"💤 Next refresh in {delay}s")
+        stop.wait(delay)
+    print("👋 Refresh daemon stopped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep the Redis cache warm with scheduled, single-flight refreshes")
+    parser.add_argument('--interval', type=int, default=int(os.getenv('REFRESH_INTERVAL', DEFAULT_INTERVAL)))
+    parser.add_argument('--lock-ttl', type=int, default=15 * 60, help="seconds; renewed while a refresh runs")
+    parser.add_argument('--health-textfile', default=os.getenv('REFRESH_HEALTH_TEXTFILE'))
+    parser.add_argument('--once', action='store_true', help="run a single locked refresh and exit")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiled('refresh_daemon', args.profile, args.profile_dir):
+        if args.once:
+            client = get_redis_client()
+            lock = RedisLock(client, LOCK_NAME, ttl_ms=args.lock_ttl * 1000)
+            health = RefreshHealth(lock.owner)
+            run_once(lock, health)
+            health.publish(client, args.health_textfile)
+        else:
+            run_daemon(args.interval, args.lock_ttl, args.health_textfile)
@@ -1,15 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
 import json
-import re
 import time
 import random
 from urllib.parse import urljoin, urlparse
 from dotenv import load_dotenv
 import os
+from slug_utils import generate_slug
 
 class MultiSourceAIToolScraper:
     def __init__(self):
+        # requests and bs4 are imported on first use so `--help` stays fast
+        import requests
+
         load_dotenv()
         self.tools = []
         self.session = requests.Session()
@@ -18,10 +19,12 @@ class MultiSourceAIToolScraper:
         })
         
     def generate_slug(self, name):
-        return re.sub(r'-+', '-', re.sub(r'\s+', '-', re.sub(r'[^a-z0-9 -]', '', name.lower()))).strip('-')
+        return generate_slug(name)
     
     def scrape_product_hunt_ai_tools(self):
         """Scrape AI tools from Product Hunt"""
+        from bs4 import BeautifulSoup
+
         tools = []
         try:
             # Product Hunt AI collection
@@ -669,5 +672,11 @@ class MultiSourceAIToolScraper:
 
 # Usage
 if __name__ == '__main__':
-    scraper = MultiSourceAIToolScraper()
-    tools = scraper.run_comprehensive_scraper(target_count=60)  # Get 60 to ensure 50+ quality tools
+    import argparse
+    from profiling import add_profile_arguments, profiled
+
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Scrape AI tools from multiple sources"))
+    args = parser.parse_args()
+    with profiled('scrapper', args.profile, args.profile_dir):
+        scraper = MultiSourceAIToolScraper()
+        tools = scraper.run_comprehensive_scraper(target_count=60)  # Get 60 to ensure 50+ quality tools
@@ -0,0 +1,286 @@
+# search_index.py
+import re
+import sys
+import json
+from array import array
+import cache_codec
+
+# All keys stay outside search:*, which rateTool in
+# controllers/toolController.js purges on every rating.
+#
+# searchidx:index is a small JSON pointer {version, generation, docs}.
+# Each trigram's posting list is a packed little-endian uint32 array of doc
+# positions under searchidx:gram:{trigram}, and searchidx:docs is a hash of
+# position -> the doc entry below, plus a "generation" field. A query reads
+# only the postings of its own trigrams and the docs they point at.
+SEARCH_INDEX_KEY = 'searchidx:index'
+SEARCH_GRAM_PREFIX = 'searchidx:gram:'
+SEARCH_DOCS_KEY = 'searchidx:docs'
+SEARCH_INDEX_VERSION = 2
+GENERATION_FIELD = 'generation'
+
+# Scoring from performTextSearch in controllers/toolController.js
+NAME_WEIGHT = 10
+TAGLINE_WEIGHT = 7
+DESCRIPTION_WEIGHT = 5
+FEATURED_BOOST = 2
+VIEWS_DIVISOR = 1000
+
+# Stop words from extractKeywords in controllers/toolController.js
+STOP_WORDS = frozenset('''
+    i me my we our you your he him his she her it its they them their what
+    which who this that these those am is are was were be been being have has
+    had having do does did doing a an the and but if or because as until while
+    of at by for with through during before after above below up down in out
+    on off over under again further then once here there when where why how
+    all any both each few more most other some such no nor not only own same
+    so than too very can will just should now
+'''.split())
+
+# JS \w and \s are ASCII-only without the u flag
+_NON_WORD = re.compile(r'[^\w\s]', re.ASCII)
+_WHITESPACE = re.compile(r'\s+')
+
+# Positions in each index doc entry
+_ID, _NAME, _TAGLINE, _DESCRIPTION, _TAGS, _STATIC_SCORE = range(6)
+
+def extract_keywords(query):
+    """Port of extractKeywords from controllers/toolController.js"""
+    words = _WHITESPACE.split(_NON_WORD.sub(' ', query.lower()))
+    return [word for word in words if len(word) > 2 and word not in STOP_WORDS][:10]
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def build_search_index(tools):
+    """Build a trigram inverted index over approved tools
+
+    tools must already be in (isFeatured desc, createdAt desc) order, as
+    fetched for allTools; a doc's position is then its tie-break rank.
+    Each doc keeps its lowercased fields so a lookup can verify the exact
+    substring semantics of the current $regex search, and the query-
+    independent part of the score (featured boost + views / 1000).
+    """
+    docs = []
+    postings = {}
+    for position, tool in enumerate(tools):
+        name = (tool.get('name') or '').lower()
+        tagline = (tool.get('tagline') or '').lower()
+        description = (tool.get('description') or '').lower()
+        tags = [tag.lower() for tag in tool.get('tags') or [] if tag]
+        views = (tool.get('analytics') or {}).get('totalViews') or 0
+        static_score = (FEATURED_BOOST if tool.get('isFeatured') else 0) + views / VIEWS_DIVISOR
+        docs.append([str(tool['_id']), name, tagline, description, tags, static_score])
+
+        grams = _trigrams(name) | _trigrams(tagline) | _trigrams(description)
+        for tag in tags:
+            grams |= _trigrams(tag)
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = [position]
+            else:
+                posting.append(position)
+
+    return {'version': SEARCH_INDEX_VERSION, 'docs': docs, 'postings': postings}
+
+def gram_key(gram):
+    return f'{SEARCH_GRAM_PREFIX}{gram}'
+
+def _pack(positions):
+    packed = array('I', positions)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+def _unpack(raw):
+    positions = array('I')
+    positions.frombytes(raw)
+    if sys.byteorder == 'big':
+        positions.byteswap()
+    return positions
+
+def search_index_payloads(index, generation=0):
+    """(docs hash mapping, {gram key: packed postings}) for publish_search_index"""
+    docs = {str(position): json.dumps(doc, separators=(',', ':'), ensure_ascii=False)
+            for position, doc in enumerate(index['docs'])}
+    docs[GENERATION_FIELD] = str(generation)
+    grams = {gram_key(gram): _pack(posting) for gram, posting in index['postings'].items()}
+    return docs, grams
+
+def _staging(key):
+    return f'{key}:staging'
+
+def publish_search_index(redis_client, index, ttl=3600, chunk_size=1000):
+    """Publish the index as per-trigram postings plus a docs hash; returns bytes written
+
+    Everything is written under staging keys and RENAMEd into place in one
+    MULTI/EXEC, together with dropping trigrams that no longer occur, so a
+    reader sees either the old index or the new one. search_redis checks
+    the docs generation against the pointer for the window between its
+    two round trips.
+    """
+    previous = cache_codec.loads(redis_client.get(SEARCH_INDEX_KEY)) or {}
+    generation = previous.get('generation', 0) + 1
+    docs, grams = search_index_payloads(index, generation)
+    old_grams = {
+        key.decode('utf-8') if isinstance(key, bytes) else key
+        for key in redis_client.scan_iter(match=f'{SEARCH_GRAM_PREFIX}*', count=1000)
+    }
+    old_grams = {key for key in old_grams if not key.endswith(':staging')} - set(grams)
+
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(_staging(SEARCH_DOCS_KEY))
+    items = list(docs.items())
+    for start in range(0, len(items), chunk_size):
+        pipe.hset(_staging(SEARCH_DOCS_KEY), mapping=dict(items[start:start + chunk_size]))
+    pipe.expire(_staging(SEARCH_DOCS_KEY), ttl)
+    for key, value in grams.items():
+        pipe.setex(_staging(key), ttl, value)
+    pipe.execute()
+
+    pointer = json.dumps({'version': SEARCH_INDEX_VERSION, 'generation': generation, 'docs': len(index['docs'])})
+    swap = redis_client.pipeline(transaction=True)
+    swap.rename(_staging(SEARCH_DOCS_KEY), SEARCH_DOCS_KEY)
+    for key in grams:
+        swap.rename(_staging(key), key)
+    old_grams = list(old_grams)
+    for start in range(0, len(old_grams), chunk_size):
+        swap.unlink(*old_grams[start:start + chunk_size])
+    swap.setex(SEARCH_INDEX_KEY, ttl, pointer)
+    swap.execute()
+    return sum(cache_codec.stored_size(value) for value in docs.values()) + sum(len(value) for value in grams.values())
+
+def _candidates(postings, term):
+    """Positions whose text contains every trigram of term; None means all docs"""
+    if len(term) < 3:
+        return None
+    lists = []
+    for gram in _trigrams(term):
+        posting = postings.get(gram)
+        if posting is None:
+            return set()
+        lists.append(posting)
+    lists.sort(key=len)
+    result = set(lists[0])
+    for posting in lists[1:]:
+        result.intersection_update(posting)
+        if not result:
+            break
+    return result
+
+def _query_terms(query):
+    query = query.strip().lower()
+    return query, [query] + extract_keywords(query) if query else []
+
+def _gather(postings, terms):
+    """Candidate positions for any term; None when a short term needs every doc"""
+    candidates = set()
+    for term in terms:
+        found = _candidates(postings, term)
+        if found is None:
+            return None
+        candidates |= found
+    return candidates
+
+def _rank(docs, candidates, query, terms, skip, limit):
+    """Verify and score candidates like performTextSearch; docs maps position -> entry"""
+    scored = []
+    for position in candidates:
+        doc = docs[position]
+        in_name = query in doc[_NAME]
+        in_tagline = query in doc[_TAGLINE]
+        in_description = query in doc[_DESCRIPTION]
+        if not (in_name or in_tagline or in_description):
+            if not any(term in tag for tag in doc[_TAGS] for term in terms):
+                continue
+        score = (NAME_WEIGHT if in_name else 0) + (TAGLINE_WEIGHT if in_tagline else 0) \
+            + (DESCRIPTION_WEIGHT if in_description else 0) + doc[_STATIC_SCORE]
+        scored.append((-score, position))
+
+    scored.sort()
+    page = scored[skip:skip + limit]
+    return len(scored), [docs[position][_ID] for _, position in page]
+
+def search(index, query, skip=0, limit=20):
+    """Look up query in an in-memory index, returning (total, [tool ids for the page])
+
+    Matches and ranks like performTextSearch: the query is a
+    case-insensitive substring of name, tagline or description, or the query
+    or one of its keywords is a substring of a tag. The query is matched
+    literally rather than as a regular expression.
+    """
+    query, terms = _query_terms(query)
+    if not query:
+        return 0, []
+    docs = index['docs']
+    candidates = _gather(index['postings'], terms)
+    if candidates is None:
+        candidates = range(len(docs))
+    return _rank(docs, candidates, query, terms, skip, limit)
+
+def search_redis(redis_client, query, skip=0, limit=20, attempts=2):
+    """search() against the published index in two round trips; None if it is not published
+
+    The first reads the pointer and the postings of the query's trigrams,
+    the second only the candidate docs. Use a bytes client
+    (decode_responses=False), as postings are binary.
+    """
+    query, terms = _query_terms(query)
+    if not query:
+        return 0, []
+    grams = sorted({gram for term in terms for gram in _trigrams(term)})
+    for _ in range(attempts):
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.get(SEARCH_INDEX_KEY)
+        for gram in grams:
+            pipe.get(gram_key(gram))
+        pointer, *raw = pipe.execute()
+        pointer = cache_codec.loads(pointer)
+        if pointer is None or pointer.get('version') != SEARCH_INDEX_VERSION:
+            return None
+        postings = {gram: _unpack(value) for gram, value in zip(grams, raw) if value is not None}
+        candidates = _gather(postings, terms)
+
+        if candidates is None:
+            entries = {
+                field.decode('utf-8') if isinstance(field, bytes) else field: value
+                for field, value in redis_client.hgetall(SEARCH_DOCS_KEY).items()
+            }
+            generation = entries.pop(GENERATION_FIELD, None)
+            fields = [int(field) for field in entries]
+            values = list(entries.values())
+        else:
+            fields = sorted(candidates)
+            *values, generation = redis_client.hmget(SEARCH_DOCS_KEY, [*fields, GENERATION_FIELD])
+        if generation is None or int(generation) != pointer['generation']:
+            continue  # republished between the two round trips
+        docs = {position: json.loads(value) for position, value in zip(fields, values) if value is not None}
+        return _rank(docs, docs.keys(), query, terms, skip, limit)
+    return None
+
+def scan_search(tools, query, skip=0, limit=20):
+    """Reference full scan with the $regex semantics of performTextSearch
+
+    tools must be in (isFeatured desc, createdAt desc) order. Used by the
+    benchmark to check parity with search().
+    """
+    query = query.strip()
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    term_patterns = [pattern] + [re.compile(re.escape(kw), re.IGNORECASE) for kw in extract_keywords(query)]
+    scored = []
+    for position, tool in enumerate(tools):
+        in_name = bool(pattern.search(tool.get('name') or ''))
+        in_tagline = bool(pattern.search(tool.get('tagline') or ''))
+        in_description = bool(pattern.search(tool.get('description') or ''))
+        in_tags = any(p.search(tag) for tag in tool.get('tags') or [] for p in term_patterns)
+        if not (in_name or in_tagline or in_description or in_tags):
+            continue
+        views = (tool.get('analytics') or {}).get('totalViews') or 0
+        score = (NAME_WEIGHT if in_name else 0) + (TAGLINE_WEIGHT if in_tagline else 0) \
+            + (DESCRIPTION_WEIGHT if in_description else 0) \
+            + (FEATURED_BOOST if tool.get('isFeatured') else 0) + views / VIEWS_DIVISOR
+        scored.append((-score, position))
+    scored.sort()
+    page = scored[skip:skip + limit]
+    return len(scored), [str(tools[position]['_id']) for _, position in page]
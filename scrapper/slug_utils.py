@@ -0,0 +1,36 @@
+# slug_utils.py
+import re
+
+# Same rules as generateSlug in models/toolModel.js:
+# lowercase, drop anything outside [a-z0-9 -], spaces -> '-', collapse '-' runs.
+# Non-ASCII characters can never survive the filter, so we drop them with an
+# ASCII encode and let bytes.translate do the rest in a single C-level pass.
+_ALLOWED = b'abcdefghijklmnopqrstuvwxyz0123456789 -'
+_DELETE = bytes(b for b in range(128) if b not in _ALLOWED)
+_SPACE_TO_DASH = bytes.maketrans(b' ', b'-')
+_DASH_RUNS = re.compile(r'-{2,}')
+
+# Batch mode joins names on NUL, which survives the translate step and is
+# split back out afterwards.
+_BATCH_SEP = '\x00'
+_BATCH_DELETE = _DELETE.replace(b'\x00', b'')
+
+def generate_slug(name):
+    """Generate URL-friendly slug from tool name"""
+    slug = name.lower().encode('ascii', 'ignore').translate(_SPACE_TO_DASH, _DELETE).decode('ascii')
+    if '--' in slug:
+        slug = _DASH_RUNS.sub('-', slug)
+    return slug.strip('-')
+
+def generate_slugs(names):
+    """Generate slugs for many tool names at once, preserving order"""
+    names = list(names)
+    if not names:
+        return []
+    joined = _BATCH_SEP.join(names)
+    if joined.count(_BATCH_SEP) != len(names) - 1:
+        # A name contains the separator itself; fall back to one at a time
+        return [generate_slug(name) for name in names]
+    slugs = joined.lower().encode('ascii', 'ignore').translate(_SPACE_TO_DASH, _BATCH_DELETE).decode('ascii')
+    slugs = _DASH_RUNS.sub('-', slugs)
+    return [slug.strip('-') for slug in slugs.split(_BATCH_SEP)]
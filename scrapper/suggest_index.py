@@ -0,0 +1,174 @@
+# suggest_index.py
+import re
+import json
+
+# All keys stay outside search:*, which rateTool purges on every rating.
+
+# Lexicographic sorted set: every member has score 0 and is
+# "fragment\0kind\0display", so ZRANGEBYLEX on a prefix finds every
+# matching suggestion. Popularity is kept out of the member, so a view
+# count change never rewrites it.
+SUGGEST_LEX_KEY = 'searchidx:suggest'
+# Hash of "kind\0display" -> popularity
+SUGGEST_SCORE_KEY = 'searchidx:suggest:score'
+# Hash of prefix -> JSON list of the top suggestions, for every prefix up to
+# TOP_PREFIX_LENGTH characters; longer prefixes rank their whole lex range
+SUGGEST_TOP_KEY = 'searchidx:suggest:top'
+
+TOP_PREFIX_LENGTH = 8
+MAX_SUGGESTIONS = 8
+NAME, TAG = 'n', 't'
+
+_SEPARATOR = '\x00'
+_LEX_MAX = '\U0010ffff'
+_CONTROL = re.compile(r'[\x00-\x1f]+')
+_WHITESPACE = re.compile(r'\s+')
+
+# One round trip: every member in the lex range plus the popularity of each,
+# HMGET in chunks to stay under Lua's unpack limit
+_LEX_RANGE_WITH_SCORES = """
+local members = redis.call('ZRANGEBYLEX', KEYS[1], ARGV[1], ARGV[2])
+local scores = {}
+for start = 1, #members, 1000 do
+    local fields = {}
+    for i = start, math.min(start + 999, #members) do
+        local member = members[i]
+        fields[#fields + 1] = string.sub(member, string.find(member, '\\0', 1, true) + 1)
+    end
+    local chunk = redis.call('HMGET', KEYS[2], unpack(fields))
+    for i = 1, #chunk do
+        scores[#scores + 1] = chunk[i] or '0'
+    end
+end
+return {members, scores}
+"""
+
+def normalize(text):
+    """Lowercase, drop control characters and collapse whitespace"""
+    return _WHITESPACE.sub(' ', _CONTROL.sub(' ', text.lower())).strip()
+
+def _fragments(normalized):
+    """The text itself plus every suffix starting at a word, so 'ai' finds 'Jasper AI'"""
+    words = normalized.split(' ')
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+def build_suggestions(tools):
+    """Map (kind, display) -> popularity from tool names and tags
+
+    Names score their tool's analytics.totalViews; tags score the views of
+    every tool carrying them plus one per tool, so unviewed tags still rank
+    by how common they are.
+    """
+    popularity = {}
+    for tool in tools:
+        views = (tool.get('analytics') or {}).get('totalViews') or 0
+        name = (tool.get('name') or '').strip()
+        if name:
+            key = (NAME, name)
+            popularity[key] = max(popularity.get(key, 0), views)
+        for tag in {tag.strip() for tag in tool.get('tags') or [] if tag and tag.strip()}:
+            key = (TAG, tag)
+            popularity[key] = popularity.get(key, 0) + views + 1
+    return popularity
+
+def _score_field(kind, display):
+    return f'{kind}{_SEPARATOR}{display}'
+
+def _members(popularity):
+    members = set()
+    for kind, display in popularity:
+        for fragment in _fragments(normalize(display)):
+            if fragment:
+                members.add(_SEPARATOR.join((fragment, kind, display)))
+    return members
+
+def _parse_member(member):
+    fragment, kind, display = member.split(_SEPARATOR, 2)
+    return fragment, kind, display
+
+def _rank(entries, limit=MAX_SUGGESTIONS):
+    """Most popular first, names before tags on ties, one entry per display text"""
+    seen = set()
+    ranked = []
+    for kind, score, display in sorted(entries, key=lambda e: (-e[1], e[0] != NAME, e[2].lower())):
+        if display not in seen:
+            seen.add(display)
+            ranked.append(display)
+            if len(ranked) == limit:
+                break
+    return ranked
+
+def _top_prefixes(members, popularity):
+    """Precomputed top suggestions for every prefix up to TOP_PREFIX_LENGTH"""
+    by_prefix = {}
+    for member in members:
+        fragment, kind, display = _parse_member(member)
+        entry = (kind, popularity[(kind, display)], display)
+        for length in range(1, min(len(fragment), TOP_PREFIX_LENGTH) + 1):
+            by_prefix.setdefault(fragment[:length], []).append(entry)
+    return {prefix: json.dumps(_rank(entries), ensure_ascii=False) for prefix, entries in by_prefix.items()}
+
+def _hash_diff(redis_client, key, wanted):
+    """(changed fields, stale fields) between a hash and the wanted mapping"""
+    existing = redis_client.hgetall(key)
+    changed = {field: value for field, value in wanted.items() if existing.get(field) != value}
+    stale = [field for field in existing if field not in wanted]
+    return changed, stale
+
+def sync_suggest_index(redis_client, tools, ttl=3600, chunk_size=1000):
+    """Bring the suggestion keys in line with tools, writing only the difference
+
+    Returns (added, removed) member counts. Unchanged suggestions are left
+    alone, so a refresh where few tools changed costs a handful of writes;
+    a changed view count only rewrites its score and the affected prefixes.
+    Use a decoding client (decode_responses=True).
+    """
+    popularity = build_suggestions(tools)
+    members = _members(popularity)
+    existing = set(redis_client.zrange(SUGGEST_LEX_KEY, 0, -1))
+    added = list(members - existing)
+    removed = list(existing - members)
+
+    scores = {_score_field(kind, display): str(score) for (kind, display), score in popularity.items()}
+    changed_scores, stale_scores = _hash_diff(redis_client, SUGGEST_SCORE_KEY, scores)
+    changed_top, stale_top = _hash_diff(redis_client, SUGGEST_TOP_KEY, _top_prefixes(members, popularity))
+
+    pipe = redis_client.pipeline(transaction=False)
+    for start in range(0, len(removed), chunk_size):
+        pipe.zrem(SUGGEST_LEX_KEY, *removed[start:start + chunk_size])
+    for start in range(0, len(added), chunk_size):
+        pipe.zadd(SUGGEST_LEX_KEY, {member: 0 for member in added[start:start + chunk_size]})
+    for key, changed, stale in ((SUGGEST_SCORE_KEY, changed_scores, stale_scores),
+                                (SUGGEST_TOP_KEY, changed_top, stale_top)):
+        for start in range(0, len(stale), chunk_size):
+            pipe.hdel(key, *stale[start:start + chunk_size])
+        changed = list(changed.items())
+        for start in range(0, len(changed), chunk_size):
+            pipe.hset(key, mapping=dict(changed[start:start + chunk_size]))
+    for key in (SUGGEST_LEX_KEY, SUGGEST_SCORE_KEY, SUGGEST_TOP_KEY):
+        pipe.expire(key, ttl)
+    pipe.execute()
+    return len(added), len(removed)
+
+def suggest(redis_client, query, limit=MAX_SUGGESTIONS):
+    """Suggestions for a typed prefix, most popular first (one round trip)
+
+    Prefixes up to TOP_PREFIX_LENGTH read their precomputed list; longer
+    ones are specific enough to rank every match in their lex range, never
+    a truncated slice of it. Use a decoding client.
+    """
+    prefix = normalize(query)
+    if len(prefix) < 2:
+        return []
+    if len(prefix) <= TOP_PREFIX_LENGTH:
+        cached = redis_client.hget(SUGGEST_TOP_KEY, prefix)
+        return json.loads(cached)[:limit] if cached else []
+    script = redis_client.register_script(_LEX_RANGE_WITH_SCORES)
+    members, scores = script(
+        keys=[SUGGEST_LEX_KEY, SUGGEST_SCORE_KEY], args=[f'[{prefix}', f'[{prefix}{_LEX_MAX}']
+    )
+    entries = []
+    for member, score in zip(members, scores):
+        _, kind, display = _parse_member(member)
+        entries.append((kind, int(score), display))
+    return _rank(entries, limit)
@@ -0,0 +1,89 @@
+# tool_cache.py
+import os
+import cache_codec
+
+TOOL_KEY_PREFIX = 'tool:'
+SLUG_KEY_PREFIX = 'tool:slug:'
+# Hash of slug -> tool id, written instead of full per-slug copies when
+# SLUG_LAYOUT=hash. The backend's getToolBySlug does not read it: it misses
+# tool:slug:{slug}, reads through to MongoDB and caches a full copy there
+# again. So the hash layout halves what the refresh writes, but tools
+# viewed by slug are still held twice until those copies expire.
+SLUG_MAP_KEY = 'tool:slugs'
+
+SLUG_LAYOUT_COPY, SLUG_LAYOUT_HASH = 'copy', 'hash'
+
+# One round trip: follow slug -> id through the map, falling back to a full
+# copy under tool:slug:{slug} (the copy layout, or one the backend cached).
+# The id key is built inside the script, so this assumes a single
+# (non-cluster) Redis, as everything else here does.
+_GET_BY_SLUG = """
+local id = redis.call('HGET', KEYS[1], ARGV[1])
+if id then
+    local value = redis.call('GET', ARGV[2] .. id)
+    if value then
+        return value
+    end
+end
+return redis.call('GET', KEYS[2])
+"""
+
+# HSET only into an existing map: on one that has expired, a lone entry
+# would otherwise recreate tool:slugs without a TTL until the next refresh
+_MAP_SLUG = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+return -1
+"""
+
+def slug_layout():
+    """SLUG_LAYOUT: copy (full JSON under tool:slug:{slug}, the default) or hash"""
+    layout = os.getenv('SLUG_LAYOUT', SLUG_LAYOUT_COPY).lower()
+    if layout not in (SLUG_LAYOUT_COPY, SLUG_LAYOUT_HASH):
+        raise ValueError(f"unknown SLUG_LAYOUT {layout!r}")
+    return layout
+
+def tool_key(tool_id):
+    return f'{TOOL_KEY_PREFIX}{tool_id}'
+
+def slug_key(slug):
+    return f'{SLUG_KEY_PREFIX}{slug}'
+
+def publish_slug_map(redis_client, tools, ttl=3600, chunk_size=1000):
+    """Replace tool:slugs with the slug -> id mapping of tools in one step
+
+    Built under a staging key and RENAMEd over the old map, so renamed or
+    removed slugs disappear without a window where lookups miss.
+    """
+    mapping = [(tool['slug'], str(tool['_id'])) for tool in tools if tool.get('slug')]
+    staging = f'{SLUG_MAP_KEY}:staging'
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(staging)
+    for start in range(0, len(mapping), chunk_size):
+        pipe.hset(staging, mapping=dict(mapping[start:start + chunk_size]))
+    if mapping:
+        pipe.rename(staging, SLUG_MAP_KEY)
+        pipe.expire(SLUG_MAP_KEY, ttl)
+    else:
+        pipe.delete(SLUG_MAP_KEY)
+    pipe.execute()
+    return len(mapping)
+
+def map_slug(redis_client, slug, tool_id):
+    """Point slug at tool_id in tool:slugs if the map exists; returns False if it did not"""
+    script = redis_client.register_script(_MAP_SLUG)
+    return script(keys=[SLUG_MAP_KEY], args=[slug, str(tool_id)]) != -1
+
+def get_tool_by_id(redis_client, tool_id):
+    """Cached tool document, or None on a miss"""
+    return cache_codec.loads(redis_client.get(tool_key(tool_id)))
+
+def get_tool_by_slug(redis_client, slug):
+    """Cached tool document for a slug under either layout, in one round trip
+
+    Use a bytes client (decode_responses=False) if values may be compressed.
+    """
+    script = redis_client.register_script(_GET_BY_SLUG)
+    raw = script(keys=[SLUG_MAP_KEY, slug_key(slug)], args=[slug, TOOL_KEY_PREFIX])
+    return cache_codec.loads(raw)
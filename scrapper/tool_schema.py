@@ -0,0 +1,196 @@
+# tool_schema.py
+
+# Enums from models/toolModel.js
+TOOL_STATUSES = ('pending', 'approved', 'rejected')
+TOOL_SOURCES = ('listed', 'scraped')
+
+# Declarative schema for scraped tools, mirroring models/toolModel.js.
+# Field specs:
+#   {"value": v}                 fixed value, input ignored
+#   {"type": "string", ...}      required -> non-empty string, else default on falsy input
+#   {"type": "list", ...}        list, default on missing/None
+#   {"type": "tags"}             comma-separated string or list -> stripped, non-empty tags
+#   {"type": "object", "fields"} nested schema applied to the input sub-object
+# "default" may be a callable for mutable defaults; "enum" restricts allowed values.
+TOOL_SCHEMA = {
+    "name": {"type": "string", "required": True},
+    "tagline": {"type": "string", "required": True},
+    "description": {"type": "string", "required": True},
+    "websiteUrl": {"type": "string", "required": True},
+    "tags": {"type": "tags"},
+    "appStoreUrl": {"type": "string", "default": ""},
+    "playStoreUrl": {"type": "string", "default": ""},
+    "status": {"value": "approved", "enum": TOOL_STATUSES},
+    "isFeatured": {"value": False},
+    "logoUrl": {"value": ""},
+    "visual": {"type": "object", "fields": {
+        "type": {"type": "string", "default": "gradient"},
+        "color": {"type": "string", "default": "#3B82F6"},
+        "content": {"type": "list", "default": list},
+    }},
+    "source": {"value": "scraped", "enum": TOOL_SOURCES},
+    "analytics": {"type": "object", "fields": {
+        "totalViews": {"value": 0},
+        "uniqueViews": {"value": 0},
+        "weeklyViews": {"value": 0},
+        "monthlyViews": {"value": 0},
+    }},
+    "commentStats": {"type": "object", "fields": {
+        "totalComments": {"value": 0},
+        "approvedComments": {"value": 0},
+    }},
+    "mediaStats": {"type": "object", "fields": {
+        "totalMedia": {"value": 0},
+        "screenshots": {"value": 0},
+        "videos": {"value": 0},
+    }},
+}
+
+class SchemaError(ValueError):
+    """Raised when a record does not satisfy the schema"""
+
+    def __init__(self, field, message):
+        super().__init__(f"{field}: {message}")
+        self.field = field
+
+def _tags_from_list(value, path):
+    if value.__class__ is not list:
+        raise SchemaError(path, f"expected string or list, got {type(value).__name__}")
+    tags = []
+    for tag in value:
+        if tag.__class__ is not str:
+            raise SchemaError(path, f"expected string tag, got {type(tag).__name__}")
+        tag = tag.strip()
+        if tag:
+            tags.append(tag)
+    return tags
+
+class _SchemaCompiler:
+    """Generates the source of a single transform function for a schema
+
+    Each field becomes a few straight-line statements and the result is
+    one nested dict literal, so the per-record cost is close to that of a
+    hand-written transform.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            'SchemaError': SchemaError,
+            '_tags_from_list': _tags_from_list,
+            '_EMPTY': {},
+        }
+        self.counter = 0
+
+    def _name(self, prefix):
+        self.counter += 1
+        return f'{prefix}{self.counter}'
+
+    def _const(self, value):
+        if value is None or value.__class__ in (str, int, bool):
+            return repr(value)
+        name = self._name('_c')
+        self.namespace[name] = value
+        return name
+
+    def _default(self, spec):
+        default = spec.get('default')
+        if callable(default):
+            return f"{self._const(default)}()"
+        return self._const(default)
+
+    def _type_error(self, indent, path, expected, var):
+        self.lines.append(
+            f"{indent}    raise SchemaError({path!r}, f\"expected {expected}, got {{type({var}).__name__}}\")"
+        )
+
+    def emit_fields(self, schema, source, prefix, indent):
+        """Emit statements for schema read from dict variable source; return a dict literal"""
+        items = []
+        for key, spec in schema.items():
+            path = prefix + key
+            if 'value' in spec:
+                if 'enum' in spec and spec['value'] not in spec['enum']:
+                    raise SchemaError(path, f"fixed value {spec['value']!r} not in {spec['enum']}")
+                items.append(f"{key!r}: {self._const(spec['value'])}")
+                continue
+
+            var = self._name('v')
+            kind = spec['type']
+            self.lines.append(f"{indent}{var} = {source}.get({key!r})")
+            if kind == 'string':
+                self.lines.append(f"{indent}if not {var}:")
+                if spec.get('required'):
+                    self.lines.append(f"{indent}    raise SchemaError({path!r}, 'is required')")
+                else:
+                    self.lines.append(f"{indent}    {var} = {self._default(spec)}")
+                self.lines.append(f"{indent}elif {var}.__class__ is not str:")
+                self._type_error(indent, path, 'string', var)
+                if spec.get('enum'):
+                    enum = self._const(frozenset(spec['enum']))
+                    self.lines.append(f"{indent}elif {var} not in {enum}:")
+                    self.lines.append(f"{indent}    raise SchemaError({path!r}, f'{{{var}!r}} not allowed')")
+            elif kind == 'list':
+                self.lines.append(f"{indent}if {var} is None:")
+                self.lines.append(f"{indent}    {var} = {self._default(spec)}")
+                self.lines.append(f"{indent}elif {var}.__class__ is not list:")
+                self._type_error(indent, path, 'list', var)
+            elif kind == 'tags':
+                self.lines.append(f"{indent}if not {var}:")
+                self.lines.append(f"{indent}    {var} = []")
+                self.lines.append(f"{indent}elif {var}.__class__ is str:")
+                self.lines.append(f"{indent}    {var} = [t for t in map(str.strip, {var}.split(',')) if t]")
+                self.lines.append(f"{indent}else:")
+                self.lines.append(f"{indent}    {var} = _tags_from_list({var}, {path!r})")
+            elif kind == 'object' and all('value' in sub for sub in spec['fields'].values()):
+                # Nothing is read from the input, so skip fetching and checking it
+                self.lines.pop()
+                items.append(f"{key!r}: {self.emit_fields(spec['fields'], var, path + '.', indent)}")
+                continue
+            elif kind == 'object':
+                self.lines.append(f"{indent}if {var} is None:")
+                self.lines.append(f"{indent}    {var} = _EMPTY")
+                self.lines.append(f"{indent}elif {var}.__class__ is not dict:")
+                self._type_error(indent, path, 'object', var)
+                items.append(f"{key!r}: {self.emit_fields(spec['fields'], var, path + '.', indent)}")
+                continue
+            else:
+                raise SchemaError(path, f"unknown field type {kind!r}")
+            items.append(f"{key!r}: {var}")
+        return '{' + ', '.join(items) + '}'
+
+def compile_schema(schema):
+    """Compile a declarative schema into a record transformer
+
+    The returned function maps one input dict to a new dict shaped by the
+    schema, raising SchemaError on invalid input. All spec interpretation
+    happens here, once; the generated function is straight-line code.
+    """
+    compiler = _SchemaCompiler()
+    compiler.lines.append("def transform(record):")
+    compiler.lines.append("    if record.__class__ is not dict:")
+    compiler._type_error('    ', '<record>', 'object', 'record')
+    result = compiler.emit_fields(schema, 'record', '', '    ')
+    compiler.lines.append(f"    return {result}")
+    source = '\n'.join(compiler.lines)
+    exec(compile(source, '<tool_schema>', 'exec'), compiler.namespace)
+    transform = compiler.namespace['transform']
+    transform.source = source
+    return transform
+
+transform_tool = compile_schema(TOOL_SCHEMA)
+
+def transform_batch(records, transform=transform_tool):
+    """Transform many records, splitting them into (valid, rejected)
+
+    Each rejected entry is a dict with the original record and the error.
+    """
+    valid = []
+    rejected = []
+    append = valid.append
+    for record in records:
+        try:
+            append(transform(record))
+        except SchemaError as e:
+            rejected.append({"record": record, "error": str(e)})
+    return valid, rejected
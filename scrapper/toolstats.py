@@ -0,0 +1,254 @@
+# toolstats.py
+import argparse
+import traceback
+from datetime import datetime, timedelta, timezone
+from checkpoints import get_checkpoint, save_checkpoint
+from connections import get_db
+from metrics import Metrics
+from profiling import add_profile_arguments, profiled
+
+# One document per (tool, granularity, bucket start):
+#   {tool, granularity: 'hour' | 'day', bucket, views, uniques, clicks,
+#    durationSum, shortViews, sources: {source: n}, countries: {country: n},
+#    clickTypes: {type: n}, updatedAt}
+# Dashboards read O(days) of these instead of scanning toolviews.
+TOOLSTATS_COLLECTION = 'toolstats'
+CHECKPOINT_NAME = 'toolstats'
+HOUR, DAY = 'hour', 'day'
+
+# Events newer than this are left for the next run, so views inserted
+# slightly out of createdAt order are not skipped by the checkpoint
+SETTLE_DELAY = timedelta(minutes=1)
+# viewController counts a view shorter than this as a bounce
+SHORT_VIEW_SECONDS = 10
+
+_COUNTERS = ('views', 'uniques', 'clicks', 'durationSum', 'shortViews')
+_BREAKDOWNS = ('sources', 'countries', 'clickTypes')
+
+def _utcnow():
+    # pymongo hands back naive UTC datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+def _day_start(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _key(value):
+    """Breakdown values become field names, so keep them free of . and $"""
+    return str(value or 'Unknown').replace('.', '_').replace('$', '_')
+
+def _empty_bucket():
+    bucket = dict.fromkeys(_COUNTERS, 0)
+    for breakdown in _BREAKDOWNS:
+        bucket[breakdown] = {}
+    return bucket
+
+def _add(target, source):
+    for counter in _COUNTERS:
+        target[counter] += source.get(counter, 0)
+    for breakdown in _BREAKDOWNS:
+        totals = target[breakdown]
+        for name, count in (source.get(breakdown) or {}).items():
+            totals[name] = totals.get(name, 0) + count
+
+def view_bucket_pipeline(since, until):
+    """Views grouped by tool, hour, source and country
+
+    uniques is the number of distinct sessions in the group; trackView
+    stores one toolview per (session, tool), so hourly uniques add up.
+    """
+    return [
+        {'$match': {'createdAt': {'$gte': since, '$lt': until}}},
+        {'$group': {
+            '_id': {
+                'tool': '$tool',
+                'hour': {'$dateToString': {'format': '%Y-%m-%dT%H', 'date': '$createdAt'}},
+                'source': '$source',
+                'country': '$country',
+            },
+            'views': {'$sum': 1},
+            'sessions': {'$addToSet': '$sessionId'},
+            'durationSum': {'$sum': '$viewDuration'},
+            'shortViews': {'$sum': {'$cond': [{'$lt': ['$viewDuration', SHORT_VIEW_SECONDS]}, 1, 0]}},
+        }},
+        {'$project': {
+            'views': 1, 'durationSum': 1, 'shortViews': 1,
+            'uniques': {'$size': '$sessions'},
+        }},
+    ]
+
+def click_bucket_pipeline(since, until):
+    """Clicks grouped by tool, hour and click type"""
+    return [
+        {'$match': {'createdAt': {'$gte': since, '$lt': until}}},
+        {'$group': {
+            '_id': {
+                'tool': '$tool',
+                'hour': {'$dateToString': {'format': '%Y-%m-%dT%H', 'date': '$createdAt'}},
+                'clickType': '$clickType',
+            },
+            'clicks': {'$sum': 1},
+        }},
+    ]
+
+def fold_hour_buckets(view_rows, click_rows):
+    """Map (tool, hour start) -> bucket from the grouped aggregation rows"""
+    buckets = {}
+    for row in view_rows:
+        group = row['_id']
+        hour = datetime.strptime(group['hour'], '%Y-%m-%dT%H')
+        _add(buckets.setdefault((group['tool'], hour), _empty_bucket()), {
+            'views': row['views'],
+            'uniques': row['uniques'],
+            'durationSum': row['durationSum'],
+            'shortViews': row['shortViews'],
+            'sources': {_key(group.get('source')): row['views']},
+            'countries': {_key(group.get('country')): row['views']},
+        })
+    for row in click_rows:
+        group = row['_id']
+        hour = datetime.strptime(group['hour'], '%Y-%m-%dT%H')
+        _add(buckets.setdefault((group['tool'], hour), _empty_bucket()), {
+            'clicks': row['clicks'],
+            'clickTypes': {_key(group.get('clickType')): row['clicks']},
+        })
+    return buckets
+
+def _bucket_update(tool_id, granularity, start, bucket, now):
+    from pymongo import UpdateOne
+
+    return UpdateOne(
+        {'tool': tool_id, 'granularity': granularity, 'bucket': start},
+        {'$set': {**bucket, 'updatedAt': now}},
+        upsert=True,
+    )
+
+def fold_day_buckets(hour_docs):
+    """Map (tool, day start) -> bucket summed from hourly toolstats documents"""
+    days = {}
+    for doc in hour_docs:
+        _add(days.setdefault((doc['tool'], _day_start(doc['bucket'])), _empty_bucket()), doc)
+    return days
+
+def ensure_indexes(db):
+    from pymongo import ASCENDING
+
+    db[TOOLSTATS_COLLECTION].create_index(
+        [('tool', ASCENDING), ('granularity', ASCENDING), ('bucket', ASCENDING)], unique=True
+    )
+
+def aggregate_toolstats(full=False, dry_run=False):
+    """Fold toolviews and clicks created since the last run into toolstats
+
+    Every hour touched by the run is recomputed from its start and written
+    with $set, and every touched day is re-summed from its hours, so a run
+    that dies before saving its checkpoint can simply be repeated. Later
+    viewDuration updates to an already-bucketed view are not picked up.
+    """
+
+    metrics = Metrics('aggregate_toolstats')
+
+    try:
+        db = get_db()
+        ensure_indexes(db)
+        now = _utcnow()
+        until = now - SETTLE_DELAY
+        checkpoint = None if full else get_checkpoint(db, CHECKPOINT_NAME)
+        # Re-read the partial hour the previous run stopped in
+        since = _hour_start(checkpoint) if checkpoint else datetime(1970, 1, 1)
+        if since >= until:
+            print("✅ toolstats already up to date")
+            return
+        print(f"🔄 Aggregating events from {since.isoformat()} to {until.isoformat()}")
+
+        with metrics.timer('views_aggregate'):
+            view_rows = list(db.toolviews.aggregate(view_bucket_pipeline(since, until), allowDiskUse=True))
+        with metrics.timer('clicks_aggregate'):
+            click_rows = list(db.clicks.aggregate(click_bucket_pipeline(since, until), allowDiskUse=True))
+        hours = fold_hour_buckets(view_rows, click_rows)
+        metrics.incr('hour_buckets', len(hours))
+        print(f"🕐 {len(hours)} hourly buckets from {len(view_rows)} view and {len(click_rows)} click groups")
+
+        if dry_run:
+            print("🧪 Dry run: nothing written")
+            return
+
+        stats = db[TOOLSTATS_COLLECTION]
+        if hours:
+            with metrics.timer('hours_write'):
+                stats.bulk_write(
+                    [_bucket_update(tool, HOUR, start, bucket, now) for (tool, start), bucket in hours.items()],
+                    ordered=False,
+                )
+
+            # Re-sum every touched day from its hourly buckets
+            tools = list({tool for tool, _ in hours})
+            with metrics.timer('days_fetch'):
+                hour_docs = stats.find(
+                    {'granularity': HOUR, 'tool': {'$in': tools}, 'bucket': {'$gte': _day_start(since)}},
+                    {'_id': 0, 'updatedAt': 0},
+                )
+                days = fold_day_buckets(hour_docs)
+            with metrics.timer('days_write'):
+                stats.bulk_write(
+                    [_bucket_update(tool, DAY, start, bucket, now) for (tool, start), bucket in days.items()],
+                    ordered=False,
+                )
+            metrics.incr('day_buckets', len(days))
+            print(f"📅 {len(days)} daily buckets updated")
+
+        save_checkpoint(db, CHECKPOINT_NAME, until, hourBuckets=len(hours))
+        print(f"✅ toolstats checkpoint saved at {until.isoformat()}")
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+def tool_dashboard(db, tool_id, start, end, granularity=DAY):
+    """Dashboard numbers for one tool from toolstats, shaped like getToolAnalytics"""
+    from pymongo import ASCENDING
+
+    docs = list(db[TOOLSTATS_COLLECTION].find(
+        {'tool': tool_id, 'granularity': granularity, 'bucket': {'$gte': start, '$lt': end}},
+        sort=[('bucket', ASCENDING)],
+    ))
+    totals = _empty_bucket()
+    daily = []
+    for doc in docs:
+        _add(totals, doc)
+        daily.append({
+            'date': doc['bucket'].strftime('%Y-%m-%d' if granularity == DAY else '%Y-%m-%dT%H:00'),
+            'views': doc['views'],
+            'uniqueViews': doc['uniques'],
+            'avgDuration': doc['durationSum'] / doc['views'] if doc['views'] else 0,
+        })
+    views = totals['views']
+    return {
+        'totalViews': views,
+        'uniqueViews': totals['uniques'],
+        'externalClicks': totals['clicks'],
+        'clickThroughRate': totals['clicks'] / views * 100 if views else 0,
+        'averageTimeOnPage': totals['durationSum'] / views if views else 0,
+        'bounceRate': totals['shortViews'] / views * 100 if views else 0,
+        'dailyData': daily,
+        'trafficSources': sorted(
+            ({'source': source, 'visits': visits} for source, visits in totals['sources'].items()),
+            key=lambda entry: -entry['visits'],
+        ),
+        'topCountries': sorted(
+            ({'_id': country, 'views': count} for country, count in totals['countries'].items()),
+            key=lambda entry: -entry['views'],
+        )[:10],
+    }
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Incrementally aggregate toolviews and clicks into toolstats"))
+    parser.add_argument('--full', action='store_true', help="ignore the checkpoint and rebuild from the first event")
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    with profiled('aggregate_toolstats', args.profile, args.profile_dir):
+        aggregate_toolstats(full=args.full, dry_run=args.dry_run)
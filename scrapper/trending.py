@@ -0,0 +1,157 @@
+# trending.py
+import argparse
+import math
+import traceback
+from datetime import datetime, timedelta, timezone
+from connections import get_db, get_redis_client
+from metrics import Metrics
+from toolstats import DAY, TOOLSTATS_COLLECTION
+from profiling import add_profile_arguments, profiled
+
+# Sorted set of approved tool ids by trendingScore; a trending listing page
+# is ZREVRANGE trending start stop
+TRENDING_KEY = 'trending'
+TRENDING_TTL = 2 * 3600
+
+# Engagement is read from daily toolstats buckets (run toolstats.py first)
+WINDOW_DAYS = 14
+HALF_LIFE_DAYS = 3
+CLICK_WEIGHT = 3
+# Ratings are shrunk towards PRIOR_RATING as if every tool had PRIOR_COUNT
+# extra ratings, so one 5-star vote does not outrank a hundred 4.8s
+PRIOR_RATING = 3.0
+PRIOR_COUNT = 5
+RATING_WEIGHT = 2
+COMMENT_WEIGHT = 1
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def decay(age_days, half_life=HALF_LIFE_DAYS):
+    return 0.5 ** (max(age_days, 0) / half_life)
+
+def engagement_by_tool(day_buckets, now, half_life=HALF_LIFE_DAYS):
+    """Map tool id -> decayed (views + CLICK_WEIGHT * clicks) over daily buckets"""
+    engagement = {}
+    for bucket in day_buckets:
+        age = (now - bucket['bucket']).total_seconds() / 86400
+        weight = decay(age, half_life)
+        value = (bucket.get('views', 0) + CLICK_WEIGHT * bucket.get('clicks', 0)) * weight
+        engagement[bucket['tool']] = engagement.get(bucket['tool'], 0) + value
+    return engagement
+
+def compute_scores(tools, engagement, now, half_life=HALF_LIFE_DAYS):
+    """Trending score for every tool, computed column by column in one pass
+
+    score = decayed engagement
+          + RATING_WEIGHT * shrunk rating / 5 * log(1 + ratings)
+          + COMMENT_WEIGHT * log(1 + approved comments) * decay(since last comment)
+    """
+    ids = [tool['_id'] for tool in tools]
+    ratings = [tool.get('averageRating') or 0 for tool in tools]
+    counts = [tool.get('numberOfRatings') or 0 for tool in tools]
+    stats = [tool.get('commentStats') or {} for tool in tools]
+    comments = [s.get('approvedComments') or 0 for s in stats]
+    comment_ages = [
+        (now - s['lastCommentAt']).total_seconds() / 86400 if s.get('lastCommentAt') else math.inf
+        for s in stats
+    ]
+
+    activity = [engagement.get(tool_id, 0) for tool_id in ids]
+    shrunk = [
+        (PRIOR_RATING * PRIOR_COUNT + rating * count) / (PRIOR_COUNT + count)
+        for rating, count in zip(ratings, counts)
+    ]
+    rating_part = [RATING_WEIGHT * value / 5 * math.log1p(count) for value, count in zip(shrunk, counts)]
+    comment_part = [
+        COMMENT_WEIGHT * math.log1p(count) * (0 if age == math.inf else decay(age, half_life))
+        for count, age in zip(comments, comment_ages)
+    ]
+    return {
+        tool_id: round(a + r + c, 4)
+        for tool_id, a, r, c in zip(ids, activity, rating_part, comment_part)
+    }
+
+def publish_trending(redis_client, scores, ttl=TRENDING_TTL, chunk_size=1000):
+    """Replace the trending sorted set atomically (build aside, then RENAME)"""
+    staging = f'{TRENDING_KEY}:staging'
+    members = [(str(tool_id), score) for tool_id, score in scores.items()]
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(staging)
+    for start in range(0, len(members), chunk_size):
+        pipe.zadd(staging, dict(members[start:start + chunk_size]))
+    if members:
+        pipe.rename(staging, TRENDING_KEY)
+        pipe.expire(TRENDING_KEY, ttl)
+    else:
+        pipe.delete(TRENDING_KEY)
+    pipe.execute()
+    return len(members)
+
+def get_trending(redis_client, page=1, limit=20):
+    """Return (total, [tool ids]) for one page of the trending listing"""
+    start = (page - 1) * limit
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zcard(TRENDING_KEY)
+    pipe.zrevrange(TRENDING_KEY, start, start + limit - 1)
+    total, ids = pipe.execute()
+    return total, ids
+
+def update_trending(dry_run=False):
+    """Score every tool, store changed scores on the tool and publish the trending set"""
+    from pymongo import UpdateOne
+
+    metrics = Metrics('update_trending')
+
+    try:
+        db = get_db()
+        now = _utcnow()
+
+        with metrics.timer('mongo_fetch'):
+            tools = list(db.tools.find({}, {
+                'status': 1, 'averageRating': 1, 'numberOfRatings': 1,
+                'commentStats': 1, 'trendingScore': 1,
+            }))
+            day_buckets = db[TOOLSTATS_COLLECTION].find(
+                {'granularity': DAY, 'bucket': {'$gte': now - timedelta(days=WINDOW_DAYS)}},
+                {'tool': 1, 'bucket': 1, 'views': 1, 'clicks': 1},
+            )
+            engagement = engagement_by_tool(day_buckets, now)
+        print(f"📊 Scoring {len(tools)} tools ({len(engagement)} with recent activity)")
+        if not engagement:
+            print("⚠️  No recent toolstats buckets; run toolstats.py to include views and clicks")
+
+        with metrics.timer('score'):
+            scores = compute_scores(tools, engagement, now)
+
+        operations = [
+            UpdateOne({'_id': tool['_id']}, {'$set': {'trendingScore': scores[tool['_id']], 'trendingUpdatedAt': now}})
+            for tool in tools
+            if tool.get('trendingScore') != scores[tool['_id']]
+        ]
+        metrics.incr('tools_changed', len(operations))
+        approved = {tool['_id']: scores[tool['_id']] for tool in tools if tool.get('status') == 'approved'}
+
+        if dry_run:
+            print(f"🧪 Dry run: {len(operations)} scores changed, {len(approved)} approved tools ranked")
+            return
+
+        if operations:
+            with metrics.timer('bulk_write'):
+                db.tools.bulk_write(operations, ordered=False)
+        with metrics.timer('redis_publish'):
+            published = publish_trending(get_redis_client(), approved)
+        print(f"✅ Stored {len(operations)} changed scores, published {published} tools to '{TRENDING_KEY}'")
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Compute time-decayed trending scores and publish the trending set"))
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    with profiled('update_trending', args.profile, args.profile_dir):
+        update_trending(dry_run=args.dry_run)
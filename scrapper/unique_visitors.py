@@ -0,0 +1,143 @@
+# unique_visitors.py
+import argparse
+import traceback
+from datetime import datetime, timedelta, timezone
+from checkpoints import get_checkpoint, save_checkpoint
+from connections import get_db, get_redis_client
+from metrics import Metrics
+from profiling import add_profile_arguments, profiled
+
+# One HyperLogLog per tool per UTC day, fed with toolview sessionIds (which
+# trackView already sets to the user id for signed-in visitors). Each sketch
+# is at most 12 KB whatever the traffic, and Redis counts with a standard
+# error of 0.81%; a union over a window (PFCOUNT of several keys) has the
+# same bound.
+HLL_PREFIX = 'hll:views:'
+CHECKPOINT_NAME = 'unique_visitors'
+RETENTION_DAYS = 90
+WEEK_DAYS = 7
+MONTH_DAYS = 30
+STANDARD_ERROR = 0.0081
+
+def sketch_key(tool_id, day):
+    return f'{HLL_PREFIX}{tool_id}:{day:%Y-%m-%d}'
+
+def sketch_expiry(day, ttl_days=RETENTION_DAYS):
+    """Unix time a day's sketch expires: the end of that UTC day plus ttl_days
+
+    Mongo returns naive datetimes in UTC, so a naive day is taken as UTC.
+    """
+    if day.tzinfo is None:
+        day = day.replace(tzinfo=timezone.utc)
+    start = day.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return int((start + timedelta(days=ttl_days + 1)).timestamp())
+
+def window_keys(tool_id, days, end=None):
+    """Daily sketch keys for the `days` UTC days ending with `end` (default today)"""
+    end = end or datetime.now(timezone.utc)
+    return [sketch_key(tool_id, end - timedelta(days=offset)) for offset in range(days)]
+
+def add_views(redis_client, views, ttl_days=RETENTION_DAYS):
+    """PFADD a batch of toolview documents into their daily sketches
+
+    Returns the number of sketches touched. PFADD is idempotent, so
+    replaying a batch after a crash never inflates the counts. Each sketch
+    expires ttl_days after its own day, not after the batch that last
+    touched it, and days already past retention are skipped.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    members = {}
+    expiries = {}
+    for view in views:
+        expires_at = sketch_expiry(view['createdAt'], ttl_days)
+        if expires_at <= now:
+            continue
+        key = sketch_key(view['tool'], view['createdAt'])
+        members.setdefault(key, []).append(view['sessionId'])
+        expiries[key] = expires_at
+
+    pipe = redis_client.pipeline(transaction=False)
+    for key, sessions in members.items():
+        pipe.pfadd(key, *sessions)
+        pipe.expireat(key, expiries[key])
+    pipe.execute()
+    return len(members)
+
+def unique_visitors(redis_client, tool_id, days=WEEK_DAYS, end=None):
+    """Approximate distinct visitors of a tool over the last `days` days"""
+    return redis_client.pfcount(*window_keys(tool_id, days, end))
+
+def merge_window(redis_client, tool_id, days, end=None, ttl=3600):
+    """PFMERGE a window into hll:views:{tool}:{days}d for readers that want one key"""
+    key = f'{HLL_PREFIX}{tool_id}:{days}d'
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.pfmerge(key, *window_keys(tool_id, days, end))
+    pipe.expire(key, ttl)
+    pipe.pfcount(key)
+    return pipe.execute()[-1]
+
+def backfill_unique_visitors(full=False, batch_size=5000, ttl_days=RETENTION_DAYS):
+    """Stream toolviews into the daily sketches, resuming from the last _id seen
+
+    Views older than ttl_days are skipped since their sketches would expire
+    straight away.
+    """
+
+    metrics = Metrics('backfill_unique_visitors')
+
+    try:
+        db = get_db()
+        redis_client = get_redis_client()
+        last_id = None if full else get_checkpoint(db, CHECKPOINT_NAME)
+        oldest = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=ttl_days)
+
+        query = {'createdAt': {'$gte': oldest}}
+        if last_id is not None:
+            query['_id'] = {'$gt': last_id}
+        total = db.toolviews.count_documents(query)
+        print(f"🔄 Adding {total} views to unique-visitor sketches...")
+
+        cursor = db.toolviews.find(
+            query, {'tool': 1, 'sessionId': 1, 'createdAt': 1}, batch_size=batch_size
+        ).sort('_id', 1)
+
+        done = 0
+        batch = []
+        for view in cursor:
+            batch.append(view)
+            if len(batch) < batch_size:
+                continue
+            with metrics.timer('pfadd_batch'):
+                metrics.incr('sketch_updates', add_views(redis_client, batch, ttl_days))
+            done += len(batch)
+            save_checkpoint(db, CHECKPOINT_NAME, batch[-1]['_id'], views=done)
+            metrics.progress('views', done, total)
+            batch = []
+        if batch:
+            with metrics.timer('pfadd_batch'):
+                metrics.incr('sketch_updates', add_views(redis_client, batch, ttl_days))
+            done += len(batch)
+            save_checkpoint(db, CHECKPOINT_NAME, batch[-1]['_id'], views=done)
+        metrics.incr('views', done)
+        metrics.progress('views', done, total, force=True)
+        print(f"✅ Sketched {done} views (±{STANDARD_ERROR:.2%} per count)")
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        traceback.print_exc()
+    finally:
+        metrics.report()
+
+if __name__ == "__main__":
+    parser = add_profile_arguments(argparse.ArgumentParser(description="Maintain per-tool daily HyperLogLog unique-visitor sketches"))
+    parser.add_argument('--full', action='store_true', help="ignore the checkpoint and re-add every retained view")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--tool', help="print weekly and monthly unique visitors for a tool id instead")
+    args = parser.parse_args()
+    with profiled('unique_visitors', args.profile, args.profile_dir):
+        if args.tool:
+            client = get_redis_client()
+            print(f"👥 {args.tool}: {unique_visitors(client, args.tool, WEEK_DAYS)} this week, "
+                  f"{unique_visitors(client, args.tool, MONTH_DAYS)} this month")
+        else:
+            backfill_unique_visitors(full=args.full, batch_size=args.batch_size)
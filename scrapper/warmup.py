@@ -0,0 +1,79 @@
+# warmup.py
+import os
+import random
+
+# getToolById/getToolBySlug read through to MongoDB on a miss, so only tools
+# that are actually visited need to be cached ahead of time. Tools are
+# ranked by the analytics counters analytics_rollup.py maintains.
+WARM_ALL, WARM_HOT = 'all', 'hot'
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def warmup_settings():
+    """WARM_POLICY (hot|all), WARM_TRAFFIC_SHARE, WARM_MIN_TOOLS, WARM_MAX_TOOLS and CACHE_TTL_JITTER"""
+    return {
+        'policy': os.getenv('WARM_POLICY', WARM_HOT).lower(),
+        'traffic_share': _env_float('WARM_TRAFFIC_SHARE', 0.95),
+        'min_tools': _env_int('WARM_MIN_TOOLS', 100),
+        'max_tools': _env_int('WARM_MAX_TOOLS', 0) or None,
+        'ttl_jitter': _env_float('CACHE_TTL_JITTER', 0.2),
+    }
+
+def recent_views(tool):
+    analytics = tool.get('analytics') or {}
+    return analytics.get('weeklyViews') or 0
+
+def traffic_rank_key(tool):
+    analytics = tool.get('analytics') or {}
+    return (
+        -(analytics.get('weeklyViews') or 0),
+        -(analytics.get('monthlyViews') or 0),
+        -(analytics.get('totalViews') or 0),
+    )
+
+def select_hot_tools(tools, traffic_share=0.95, min_tools=100, max_tools=None):
+    """Pick the tools worth caching eagerly and project what that buys
+
+    Tools are taken busiest first until they account for traffic_share of
+    last week's views, never fewer than min_tools nor more than max_tools;
+    featured tools are always included. Returns (hot tools, projection)
+    where projection['hit_rate'] assumes next week's views are distributed
+    like last week's.
+    """
+    ranked = sorted(tools, key=traffic_rank_key)
+    total_views = sum(recent_views(tool) for tool in ranked)
+    target = total_views * traffic_share
+
+    hot = []
+    covered = 0
+    for tool in ranked:
+        if max_tools is not None and len(hot) >= max_tools:
+            break
+        if len(hot) >= min_tools and covered >= target:
+            break
+        hot.append(tool)
+        covered += recent_views(tool)
+
+    chosen = {id(tool) for tool in hot}
+    hot.extend(tool for tool in tools if tool.get('isFeatured') and id(tool) not in chosen)
+    covered = sum(recent_views(tool) for tool in hot)
+
+    return hot, {
+        'hot_tools': len(hot),
+        'all_tools': len(tools),
+        'recent_views': total_views,
+        'hit_rate': covered / total_views if total_views else None,
+    }
+
+def jittered_ttl(base, jitter=0.2, rng=random):
+    """base TTL stretched by up to jitter * base, so keys written together expire apart
+
+    Never shorter than base, so a key still outlives the next scheduled refresh.
+    """
+    return int(base * (1 + rng.uniform(0, jitter)))